@@ -0,0 +1,32 @@
+# backfill_salaries.py
+"""
+Fill the parsed salary columns (salary_min, salary_max, salary_currency,
+salary_period) of job descriptions saved before they existed. New and updated
+jobs are parsed when saved. Safe to stop and rerun; rows already parsed are
+skipped unless --reparse is given (e.g. after improving utils/salary.py):
+
+    python backfill_salaries.py
+    python backfill_salaries.py --reparse --batch-size 5000
+"""
+import argparse
+import json
+import sys
+from utils.salary import backfill_salaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse salary_range into the salary columns for existing jobs")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows updated per transaction")
+    parser.add_argument("--reparse", action="store_true", help="parse every row again, not just unparsed ones")
+    args = parser.parse_args()
+
+    def progress(summary):
+        print(f"{summary['scanned']} rows scanned, {summary['parsed']} parsed", file=sys.stderr)
+
+    summary = backfill_salaries(args.batch_size, args.reparse, progress)
+    print(json.dumps(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
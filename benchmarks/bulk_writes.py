@@ -0,0 +1,121 @@
+# benchmarks/bulk_writes.py
+"""
+Round-trip benchmark for saving a job description.
+
+Saves synthetic job descriptions with a growing number of skills and benefits,
+once with the old one-INSERT-per-child loop and once through
+insert_job_description, counting the statements each sends to Postgres. The
+per-row loop grows with the number of skills; the bulk path stays at three
+statements per job (the job row, its skills and its benefits).
+
+Every save runs in a transaction that is rolled back, so the database is left
+unchanged. Uses the DB_* settings from .env.
+
+Usage:
+    python benchmarks/bulk_writes.py --skills 5 20 40 80 --repeat 20
+"""
+import argparse
+import os
+import sys
+import time
+
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import get_db_connection
+from routers.job_descriptions import insert_job_description
+from utils.skills import insert_job_skills
+
+
+class CountingCursor(RealDictCursor):
+    """Cursor that counts the statements it sends to the server"""
+
+    statements = 0
+
+    def execute(self, query, vars=None):
+        CountingCursor.statements += 1
+        return super().execute(query, vars)
+
+
+def make_job(skill_count):
+    return {
+        "title": "Benchmark Engineer",
+        "company": "Benchmark Co",
+        "location": "Remote",
+        "description": "Synthetic job description for the bulk write benchmark",
+        "experience_required": "3 years",
+        "education_required": "",
+        "job_type": "Full-time",
+        "salary_range": "",
+        "application_url": "",
+        "contact_email": "",
+        "date_posted": "",
+        "required_skills": [f"Required Skill {i}" for i in range(skill_count)],
+        "preferred_skills": [f"Preferred Skill {i}" for i in range(skill_count // 2)],
+        "benefits": [f"Benefit {i}" for i in range(skill_count // 4)]
+    }
+
+
+def insert_per_row(cursor, job_data):
+    """The previous write path: one INSERT per skill and per benefit"""
+    cursor.execute("""
+    INSERT INTO job_descriptions (
+        title, company, location, description, experience_required,
+        education_required, job_type, salary_range, application_url,
+        contact_email, date_posted
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    RETURNING id
+    """, (
+        job_data["title"], job_data["company"], job_data["location"], job_data["description"],
+        job_data["experience_required"], job_data["education_required"], job_data["job_type"],
+        job_data["salary_range"], job_data["application_url"], job_data["contact_email"],
+        job_data["date_posted"]
+    ))
+    job_id = cursor.fetchone()["id"]
+
+    for skill in job_data["required_skills"]:
+        insert_job_skills(cursor, job_id, [skill], [])
+    for skill in job_data["preferred_skills"]:
+        insert_job_skills(cursor, job_id, [], [skill])
+    for benefit in job_data["benefits"]:
+        cursor.execute("INSERT INTO job_benefits (job_id, benefit) VALUES (%s, %s)", (job_id, benefit))
+    return job_id
+
+
+def measure(insert, job_data, repeat):
+    """Return (statements per job, milliseconds per job) for an insert function"""
+    conn = get_db_connection()
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    try:
+        CountingCursor.statements = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            insert(cursor, job_data)
+        elapsed = time.perf_counter() - start
+        return CountingCursor.statements / repeat, elapsed * 1000 / repeat
+    finally:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare round trips per saved job description")
+    parser.add_argument("--skills", type=int, nargs="+", default=[5, 20, 40, 80],
+                        help="required skills per job (preferred = half, benefits = quarter)")
+    parser.add_argument("--repeat", type=int, default=20, help="jobs saved per measurement")
+    args = parser.parse_args()
+
+    print(f"{'skills':>6} {'children':>8} | {'per-row stmts':>13} {'ms':>7} | {'bulk stmts':>10} {'ms':>7}")
+    for skill_count in args.skills:
+        job_data = make_job(skill_count)
+        children = len(job_data["required_skills"]) + len(job_data["preferred_skills"]) + len(job_data["benefits"])
+        row_statements, row_ms = measure(insert_per_row, job_data, args.repeat)
+        bulk_statements, bulk_ms = measure(insert_job_description, job_data, args.repeat)
+        print(f"{skill_count:>6} {children:>8} | {row_statements:>13.0f} {row_ms:>7.2f} | "
+              f"{bulk_statements:>10.0f} {bulk_ms:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
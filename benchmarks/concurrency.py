@@ -0,0 +1,88 @@
+# benchmarks/concurrency.py
+"""
+Concurrency benchmark for the API.
+
+Fires the same request sequentially and then concurrently against a running
+server, and measures the latency of a cheap probe endpoint while a burst of
+slow requests is in flight. If handlers block the event loop, the concurrent
+wall time approaches the sequential one and probe latency tracks the slow
+requests; with non-blocking handlers both stay close to their idle values.
+
+Usage:
+    uvicorn main:app --workers 1
+    python benchmarks/concurrency.py --endpoint /stats --requests 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def timed_get(client, path):
+    start = time.perf_counter()
+    response = await client.get(path)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run_sequential(client, path, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        await timed_get(client, path)
+    return time.perf_counter() - start
+
+
+async def run_concurrent(client, path, count):
+    start = time.perf_counter()
+    await asyncio.gather(*(timed_get(client, path) for _ in range(count)))
+    return time.perf_counter() - start
+
+
+async def probe_latencies(client, probe, count, interval):
+    latencies = []
+    for _ in range(count):
+        latencies.append(await timed_get(client, probe))
+        await asyncio.sleep(interval)
+    return latencies
+
+
+def describe(latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"median {statistics.median(ordered) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms"
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        # Warm up connections and caches
+        await timed_get(client, args.endpoint)
+        await timed_get(client, args.probe)
+
+        sequential = await run_sequential(client, args.endpoint, args.requests)
+        concurrent = await run_concurrent(client, args.endpoint, args.requests)
+        print(f"{args.requests} x GET {args.endpoint}")
+        print(f"  sequential wall time: {sequential:.3f} s")
+        print(f"  concurrent wall time: {concurrent:.3f} s")
+        print(f"  speedup:              {sequential / concurrent:.2f}x (about 1x means requests serialize)")
+
+        idle = await probe_latencies(client, args.probe, args.probes, args.probe_interval)
+        burst = asyncio.gather(*(timed_get(client, args.endpoint) for _ in range(args.requests)))
+        loaded = await probe_latencies(client, args.probe, args.probes, args.probe_interval)
+        await burst
+        print(f"GET {args.probe} latency")
+        print(f"  idle:                 {describe(idle)}")
+        print(f"  during slow burst:    {describe(loaded)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure whether concurrent requests serialize on a worker")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", default="/stats", help="slow endpoint to load the worker with")
+    parser.add_argument("--probe", default="/", help="cheap endpoint whose latency is sampled")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--probes", type=int, default=20)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))
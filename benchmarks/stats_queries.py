@@ -0,0 +1,220 @@
+# benchmarks/stats_queries.py
+"""
+Benchmark for computing the /stats response.
+
+Grows job_descriptions with synthetic jobs (and job_skills with a few skills
+each) to every requested size and times three ways of computing /stats:
+
+- per section: the original endpoint, eleven queries (one per section of the
+  response), each scanning job_descriptions or job_skills
+- grouping sets: one statement that scans each table once, grouping every
+  facet with GROUPING SETS and returning the response as JSON
+- rollups: routers.stats.JOB_STATS_QUERY, one statement reading top-N rows
+  from the trigger-maintained rollup tables
+
+Everything runs in one transaction that is rolled back, so the database is
+left unchanged. Uses the DB_* settings from .env.
+
+Usage:
+    python benchmarks/stats_queries.py --jobs 100000 1000000 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import get_db_connection
+from routers.stats import JOB_STATS_QUERY
+
+PER_SECTION_QUERIES = [
+    "SELECT COUNT(*) as job_count FROM job_descriptions",
+    "SELECT COUNT(DISTINCT company) as company_count FROM job_descriptions",
+    "SELECT COUNT(DISTINCT location) as location_count FROM job_descriptions",
+    """
+    SELECT s.name as skill, top.count
+    FROM (
+        SELECT skill_id, COUNT(*) as count FROM job_skills WHERE is_required = TRUE
+        GROUP BY skill_id ORDER BY count DESC LIMIT 10
+    ) top
+    JOIN skills s ON s.id = top.skill_id
+    ORDER BY top.count DESC
+    """,
+    """
+    SELECT s.name as skill, top.count
+    FROM (
+        SELECT skill_id, COUNT(*) as count FROM job_skills WHERE is_required = FALSE
+        GROUP BY skill_id ORDER BY count DESC LIMIT 10
+    ) top
+    JOIN skills s ON s.id = top.skill_id
+    ORDER BY top.count DESC
+    """,
+    """
+    SELECT job_type, COUNT(*) as count FROM job_descriptions
+    WHERE job_type != '' GROUP BY job_type ORDER BY count DESC
+    """,
+    "SELECT id, title, company, location, created_at FROM job_descriptions ORDER BY created_at DESC LIMIT 5",
+    """
+    SELECT experience_required, COUNT(*) as count FROM job_descriptions
+    WHERE experience_required != '' GROUP BY experience_required ORDER BY count DESC LIMIT 10
+    """,
+    """
+    SELECT education_required, COUNT(*) as count FROM job_descriptions
+    WHERE education_required != '' GROUP BY education_required ORDER BY count DESC LIMIT 10
+    """,
+    "SELECT company, COUNT(*) as job_count FROM job_descriptions GROUP BY company ORDER BY job_count DESC LIMIT 10",
+    "SELECT location, COUNT(*) as job_count FROM job_descriptions GROUP BY location ORDER BY job_count DESC LIMIT 10",
+]
+
+GROUPING_SETS_QUERY = """
+WITH facet_counts AS (
+    SELECT
+        CASE
+            WHEN GROUPING(company) = 0 THEN 'company'
+            WHEN GROUPING(location) = 0 THEN 'location'
+            WHEN GROUPING(job_type) = 0 THEN 'job_type'
+            WHEN GROUPING(experience_required) = 0 THEN 'experience'
+            WHEN GROUPING(education_required) = 0 THEN 'education'
+            ELSE 'jobs'
+        END AS facet,
+        COALESCE(company, location, job_type, experience_required, education_required) AS value,
+        COUNT(*) AS job_count
+    FROM job_descriptions
+    GROUP BY GROUPING SETS ((company), (location), (job_type), (experience_required), (education_required), ())
+),
+ranked_facets AS (
+    SELECT *, row_number() OVER (PARTITION BY facet ORDER BY job_count DESC) AS rank
+    FROM facet_counts
+    WHERE facet IN ('company', 'location') OR value <> ''
+),
+ranked_skills AS (
+    SELECT skill_id, is_required, COUNT(*) AS job_count,
+           row_number() OVER (PARTITION BY is_required ORDER BY COUNT(*) DESC) AS rank
+    FROM job_skills
+    GROUP BY skill_id, is_required
+)
+SELECT json_build_object(
+    'summary', json_build_object(
+        'job_count', (SELECT job_count FROM facet_counts WHERE facet = 'jobs'),
+        'company_count', (SELECT COUNT(*) FROM facet_counts WHERE facet = 'company' AND value IS NOT NULL),
+        'location_count', (SELECT COUNT(*) FROM facet_counts WHERE facet = 'location' AND value IS NOT NULL)
+    ),
+    'top_required_skills', (
+        SELECT json_agg(json_build_object('skill', s.name, 'count', r.job_count) ORDER BY r.rank)
+        FROM ranked_skills r JOIN skills s ON s.id = r.skill_id WHERE r.is_required AND r.rank <= 10
+    ),
+    'top_preferred_skills', (
+        SELECT json_agg(json_build_object('skill', s.name, 'count', r.job_count) ORDER BY r.rank)
+        FROM ranked_skills r JOIN skills s ON s.id = r.skill_id WHERE NOT r.is_required AND r.rank <= 10
+    ),
+    'job_types', (
+        SELECT json_agg(json_build_object('type', value, 'count', job_count) ORDER BY rank)
+        FROM ranked_facets WHERE facet = 'job_type'
+    ),
+    'recent_jobs', (
+        SELECT json_agg(recent ORDER BY recent.created_at DESC) FROM (
+            SELECT id, title, company, location, created_at FROM job_descriptions ORDER BY created_at DESC LIMIT 5
+        ) recent
+    ),
+    'experience_levels', (
+        SELECT json_agg(json_build_object('level', value, 'count', job_count) ORDER BY rank)
+        FROM ranked_facets WHERE facet = 'experience' AND rank <= 10
+    ),
+    'education_requirements', (
+        SELECT json_agg(json_build_object('education', value, 'count', job_count) ORDER BY rank)
+        FROM ranked_facets WHERE facet = 'education' AND rank <= 10
+    ),
+    'top_companies', (
+        SELECT json_agg(json_build_object('company', value, 'job_count', job_count) ORDER BY rank)
+        FROM ranked_facets WHERE facet = 'company' AND rank <= 10
+    ),
+    'top_locations', (
+        SELECT json_agg(json_build_object('location', value, 'job_count', job_count) ORDER BY rank)
+        FROM ranked_facets WHERE facet = 'location' AND rank <= 10
+    )
+) AS stats
+"""
+
+VARIANTS = [
+    ("per section", PER_SECTION_QUERIES),
+    ("grouping sets", [GROUPING_SETS_QUERY]),
+    ("rollups", [JOB_STATS_QUERY]),
+]
+
+
+def add_jobs(cursor, start, stop, skills_per_job):
+    """Insert synthetic jobs start..stop-1 with skills_per_job skills each, in two statements"""
+    cursor.execute("""
+    INSERT INTO job_descriptions (
+        title, company, location, description, experience_required, education_required, job_type
+    )
+    SELECT
+        'Benchmark Job ' || i,
+        'Benchmark Company ' || (i %% 5000),
+        'Benchmark City ' || (i %% 500),
+        'Synthetic job description for the stats benchmark',
+        (i %% 15) || ' years',
+        (ARRAY['', 'Bachelor''s degree', 'Master''s degree', 'PhD'])[1 + i %% 4],
+        (ARRAY['Full-time', 'Part-time', 'Contract', 'Internship'])[1 + i %% 4]
+    FROM generate_series(%s, %s - 1) AS i
+    """, (start, stop))
+    cursor.execute("""
+    INSERT INTO job_skills (job_id, skill_id, is_required)
+    SELECT jd.id, s.id, n = 0
+    FROM job_descriptions jd
+    CROSS JOIN generate_series(0, %s - 1) AS n
+    JOIN skills s ON s.normalized_name = 'benchmark skill ' || ((jd.id * 7 + n * 131) %% 2000)
+    WHERE jd.title LIKE 'Benchmark Job %%' AND jd.id > (SELECT COALESCE(MAX(job_id), 0) FROM job_skills)
+    """, (skills_per_job,))
+
+
+def time_variant(cursor, statements, repeat):
+    """Median milliseconds to run the statements and fetch their rows"""
+    timings = []
+    for _ in range(repeat + 1):
+        start = time.perf_counter()
+        for sql in statements:
+            cursor.execute(sql)
+            cursor.fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ways of computing the /stats response")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="synthetic job counts to measure at (cumulative)")
+    parser.add_argument("--skills-per-job", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per variant (after one warm-up)")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+        INSERT INTO skills (name, normalized_name)
+        SELECT 'Benchmark Skill ' || i, 'benchmark skill ' || i FROM generate_series(0, 1999) AS i
+        ON CONFLICT (normalized_name) DO NOTHING
+        """)
+
+        print(f"{'jobs':>9} | " + " | ".join(f"{f'{name} ({len(sql)} stmt)':>22}" for name, sql in VARIANTS))
+        added = 0
+        for jobs in sorted(args.jobs):
+            start = time.perf_counter()
+            add_jobs(cursor, added, jobs, args.skills_per_job)
+            added = jobs
+            cursor.execute("ANALYZE job_descriptions, job_skills, job_facet_counts, skill_counts")
+            print(f"  (loaded {jobs} jobs in {time.perf_counter() - start:.1f}s)")
+
+            timings = [time_variant(cursor, sql, args.repeat) for _, sql in VARIANTS]
+            print(f"{jobs:>9} | " + " | ".join(f"{ms:>19.1f} ms" for ms in timings))
+    finally:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,6 @@
 import os
 from dotenv import load_dotenv
 import google.generativeai as genai
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from fastapi import HTTPException
 
 # Load environment variables
 load_dotenv()
@@ -21,6 +18,77 @@ DB_NAME = os.getenv("DB_NAME", "")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 
+# Connection pool configuration
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a free connection
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))  # recycle connections after this many seconds
+DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))  # close idle connections above min size after this many seconds
+DB_POOL_CHECK_INTERVAL = float(os.getenv("DB_POOL_CHECK_INTERVAL", "30"))  # ping connections idle longer than this before reuse
+
+# Worker threads that run the synchronous (def) route handlers and other blocking database calls
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+
+# Document analysis executors: worker processes for parsing/rendering, threads for Gemini calls
+DOC_PROCESS_WORKERS = int(os.getenv("DOC_PROCESS_WORKERS", str(os.cpu_count() or 2)))
+GEMINI_IO_WORKERS = int(os.getenv("GEMINI_IO_WORKERS", "8"))
+
+# Gemini client limits, per process: split the project quota across API and worker processes
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "1000"))
+GEMINI_TOKENS_PER_MINUTE = int(os.getenv("GEMINI_TOKENS_PER_MINUTE", "1000000"))
+GEMINI_RATE_LIMIT_WAIT = float(os.getenv("GEMINI_RATE_LIMIT_WAIT", "30"))  # longest a call queues for quota, seconds
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "0.5"))  # seconds
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "8"))  # seconds
+GEMINI_BREAKER_FAILURES = int(os.getenv("GEMINI_BREAKER_FAILURES", "5"))  # consecutive failures that open the circuit
+GEMINI_BREAKER_RESET_SECONDS = float(os.getenv("GEMINI_BREAKER_RESET_SECONDS", "30"))
+
+# Documents estimated above this many input tokens per call are split into chunks extracted in parallel
+GEMINI_INPUT_TOKEN_BUDGET = int(os.getenv("GEMINI_INPUT_TOKEN_BUDGET", "12000"))
+GEMINI_CHUNK_WORKERS = int(os.getenv("GEMINI_CHUNK_WORKERS", "4"))
+
+# Analysis task queue (see worker.py)
+TASK_POLL_INTERVAL = float(os.getenv("TASK_POLL_INTERVAL", "1"))  # seconds between claims when the queue is empty
+TASK_LOCK_TIMEOUT = int(os.getenv("TASK_LOCK_TIMEOUT", "300"))  # seconds before a silent worker's task is reclaimed
+TASK_HEARTBEAT_INTERVAL = float(os.getenv("TASK_HEARTBEAT_INTERVAL", "30"))  # seconds between lock refreshes while a task runs
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "3"))
+
+# PDF page images sent to Gemini: only documents averaging fewer than PDF_TEXT_DENSITY_THRESHOLD
+# extracted characters per page (scans, image-only PDFs) get up to PDF_SCANNED_MAX_PAGES rendered pages
+PDF_TEXT_DENSITY_THRESHOLD = int(os.getenv("PDF_TEXT_DENSITY_THRESHOLD", "200"))
+PDF_SCANNED_MAX_PAGES = int(os.getenv("PDF_SCANNED_MAX_PAGES", "3"))
+# Long PDFs: pages past PDF_MAX_PAGES are ignored, and documents over PDF_PARALLEL_PAGE_THRESHOLD pages
+# have their text extracted in page ranges (at least PDF_MIN_PAGES_PER_TASK each) across the process pool
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "100"))
+PDF_PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "40"))
+PDF_MIN_PAGES_PER_TASK = int(os.getenv("PDF_MIN_PAGES_PER_TASK", "10"))
+PDF_RENDER_DPI = int(os.getenv("PDF_RENDER_DPI", "100"))
+PDF_RENDER_FORMAT = os.getenv("PDF_RENDER_FORMAT", "jpeg").lower()  # jpeg or png
+PDF_RENDER_JPEG_QUALITY = int(os.getenv("PDF_RENDER_JPEG_QUALITY", "75"))
+
+# Largest document accepted by the analysis endpoints
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+
+# Batch analysis: documents analyzed at once per request, and files and total bytes accepted per request
+ANALYZE_BATCH_CONCURRENCY = int(os.getenv("ANALYZE_BATCH_CONCURRENCY", "8"))
+ANALYZE_BATCH_MAX_FILES = int(os.getenv("ANALYZE_BATCH_MAX_FILES", "200"))
+ANALYZE_BATCH_MAX_BYTES = int(os.getenv("ANALYZE_BATCH_MAX_BYTES", str(256 * 1024 * 1024)))  # whole request
+
+# Gemini extraction result cache (in-process LRU backed by the extraction_cache table)
+EXTRACTION_CACHE_MEMORY_SIZE = int(os.getenv("EXTRACTION_CACHE_MEMORY_SIZE", "1024"))
+EXTRACTION_CACHE_TTL = int(os.getenv("EXTRACTION_CACHE_TTL", str(30 * 24 * 3600)))  # seconds
+EXTRACTION_CACHE_DB_MAX_ROWS = int(os.getenv("EXTRACTION_CACHE_DB_MAX_ROWS", "100000"))
+
+# Stats endpoint response cache (per process): responses are fresh for TTL seconds, then served
+# stale for up to STALE_TTL more while a background refresh runs; cleared by job description writes
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "30"))
+STATS_CACHE_STALE_TTL = float(os.getenv("STATS_CACHE_STALE_TTL", "300"))
+STATS_CACHE_MAX_ENTRIES = int(os.getenv("STATS_CACHE_MAX_ENTRIES", "256"))
+
+# Bulk import (/api/job-descriptions/import and import_jobs.py): rows per COPY batch and per-row errors kept in the report
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+
 # Configure Gemini model
 genai.configure(api_key=GOOGLE_API_KEY)
 
@@ -39,17 +107,8 @@ MODEL = genai.GenerativeModel(
 
 
 def get_db_connection():
-    try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            dbname=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            cursor_factory=RealDictCursor
-        )
-        return conn
-    except Exception as e:
-        print(f"Database connection error: {e}")
-        raise HTTPException(status_code=500, detail=f"Database connection error: {str(e)}")
+    """Return a connection from the shared pool (see database.get_db_connection)"""
+    # Imported lazily because database.py imports its settings from this module
+    from database import get_db_connection as get_pooled_connection
+    return get_pooled_connection()
 # Initialize database tables
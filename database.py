@@ -1,184 +1,219 @@
 # database.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
 from fastapi import HTTPException
-from config import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+from config import (
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD,
+    DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT,
+    DB_POOL_MAX_LIFETIME, DB_POOL_MAX_IDLE, DB_POOL_CHECK_INTERVAL
+)
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available within the wait timeout"""
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection whose close() hands it back to the pool instead of disconnecting"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = None
+        self._checked_out = False
+        self._created_at = time.monotonic()
+        self._last_used_at = self._created_at
+
+    def close(self):
+        if self._pool is None:
+            super().close()
+        elif self._checked_out:
+            self._pool.putconn(self)
+
+    def __del__(self):
+        # Dropped while checked out (close() never called): give its slot back so the pool cannot shrink
+        if getattr(self, "_checked_out", False) and self._pool is not None:
+            self._pool.release_abandoned(self)
+
+    def _disconnect(self):
+        self._pool = None
+        self._checked_out = False
+        if not self.closed:
+            super().close()
+
+
+class ConnectionPool:
+    """Thread-safe PostgreSQL connection pool with health checks, recycling and a bounded wait"""
+
+    def __init__(self, min_size, max_size, timeout, max_lifetime, max_idle, check_interval, **connect_kwargs):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.check_interval = check_interval
+        self._connect_kwargs = connect_kwargs
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle.append(self._connect())
+
+    def _connect(self):
+        conn = psycopg2.connect(connection_factory=PooledConnection, **self._connect_kwargs)
+        conn._pool = self
+        return conn
+
+    def _expired(self, conn, now):
+        return now - conn._created_at > self.max_lifetime
+
+    def _healthy(self, conn, now):
+        if conn.closed:
+            return False
+        if now - conn._last_used_at < self.check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        """Check out a connection, waiting at most `timeout` seconds for a free slot"""
+        if self._closed:
+            raise PoolTimeout("Connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"No database connection available after {self.timeout}s")
+
+        try:
+            while True:
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    conn = self._connect()
+                    break
+
+                now = time.monotonic()
+                if not self._expired(conn, now) and self._healthy(conn, now):
+                    break
+                conn._disconnect()
+        except Exception:
+            self._slots.release()
+            raise
+
+        conn._checked_out = True
+        return conn
+
+    def putconn(self, conn):
+        """Return a connection to the pool, resetting any open transaction"""
+        if conn._pool is not self or not conn._checked_out:
+            return
+        conn._checked_out = False
+        now = time.monotonic()
+        conn._last_used_at = now
+
+        try:
+            keep = not self._closed and not conn.closed and not self._expired(conn, now)
+            if keep:
+                try:
+                    if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                        conn.rollback()
+                    if conn.autocommit:
+                        conn.autocommit = False
+                except psycopg2.Error:
+                    keep = False
+
+            if keep:
+                with self._lock:
+                    self._discard_idle(now)
+                    self._idle.append(conn)
+            else:
+                conn._disconnect()
+        finally:
+            self._slots.release()
+
+    def release_abandoned(self, conn):
+        """Free the slot of a checked-out connection being garbage-collected; the connection itself is not reused"""
+        conn._checked_out = False
+        print("Database connection garbage-collected while checked out; releasing its pool slot")
+        self._slots.release()
+
+    def _discard_idle(self, now):
+        # Close connections above min size that have sat unused for too long; called with the lock held
+        while len(self._idle) > self.min_size and now - self._idle[0]._last_used_at > self.max_idle:
+            self._idle.popleft()._disconnect()
+
+    def closeall(self):
+        self._closed = True
+        with self._lock:
+            while self._idle:
+                self._idle.popleft()._disconnect()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    timeout=DB_POOL_TIMEOUT,
+                    max_lifetime=DB_POOL_MAX_LIFETIME,
+                    max_idle=DB_POOL_MAX_IDLE,
+                    check_interval=DB_POOL_CHECK_INTERVAL,
+                    host=DB_HOST,
+                    port=DB_PORT,
+                    dbname=DB_NAME,
+                    user=DB_USER,
+                    password=DB_PASSWORD,
+                    cursor_factory=RealDictCursor
+                )
+    return _pool
+
+
+def close_pool():
+    """Close every idle pooled connection (called on application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
 
 def get_db_connection():
-    """Create and return a database connection"""
+    """Check out a pooled database connection; conn.close() returns it to the pool"""
     try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            dbname=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            cursor_factory=RealDictCursor
-        )
-        return conn
+        return get_pool().getconn()
+    except PoolTimeout as e:
+        print(f"Database pool exhausted: {e}")
+        raise HTTPException(status_code=503, detail=f"Database busy: {str(e)}")
     except Exception as e:
         print(f"Database connection error: {e}")
         raise HTTPException(status_code=500, detail=f"Database connection error: {str(e)}")
 
-def init_db():
-    """Initialize database tables"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    try:
-        # Create job_descriptions table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS job_descriptions (
-            id SERIAL PRIMARY KEY,
-            title VARCHAR(255) NOT NULL,
-            company VARCHAR(255) NOT NULL,
-            location VARCHAR(255) NOT NULL,
-            description TEXT NOT NULL,
-            experience_required VARCHAR(255),
-            education_required TEXT,
-            job_type VARCHAR(100),
-            salary_range VARCHAR(255),
-            application_url TEXT,
-            contact_email VARCHAR(255),
-            date_posted VARCHAR(100),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-        # Create skills tables
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS job_skills (
-            id SERIAL PRIMARY KEY,
-            job_id INTEGER REFERENCES job_descriptions(id) ON DELETE CASCADE,
-            skill VARCHAR(255) NOT NULL,
-            is_required BOOLEAN NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-        # Create benefits table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS job_benefits (
-            id SERIAL PRIMARY KEY,
-            job_id INTEGER REFERENCES job_descriptions(id) ON DELETE CASCADE,
-            benefit TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-
-        # Create the recruiters table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS recruiters (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                email VARCHAR(255),
-                phone VARCHAR(50),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-        
-        # Create skill ratings table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS job_skill_ratings (
-            id SERIAL PRIMARY KEY,
-            job_id INTEGER NOT NULL,
-            skill_name VARCHAR(255) NOT NULL,
-            rating INTEGER NOT NULL,
-            is_required BOOLEAN NOT NULL
-        )
-        """)
-        
-        cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'job_recruiter_assignments'
-                )
-            """)
-        
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Jd_Resume_Final_feedback (
-            id SERIAL PRIMARY KEY,
-            Jd_id VARCHAR(255) NOT NULL,
-            resume1 VARCHAR(255) NOT NULL,
-            resume2 VARCHAR(255) NOT NULL,
-            Final_Feedback TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-
-        table_exists = cursor.fetchone()['exists']
-        if not table_exists:
-                # Create job_recruiter_assignments table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS job_recruiter_assignments (
-                        id SERIAL PRIMARY KEY,
-                        job_id INTEGER NOT NULL,
-                        recruiter_id INTEGER NOT NULL,
-                        assigned_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        CONSTRAINT fk_job
-                            FOREIGN KEY(job_id)
-                            REFERENCES job_descriptions(id)
-                            ON DELETE CASCADE,
-                        CONSTRAINT fk_recruiter
-                            FOREIGN KEY(recruiter_id)
-                            REFERENCES recruiters(id)
-                            ON DELETE CASCADE,
-                        CONSTRAINT unique_job_recruiter UNIQUE (job_id, recruiter_id)
-                    )
-                """)
-                
-                # Create indices
-            cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_job_recruiter_job_id 
-                    ON job_recruiter_assignments(job_id)
-                """)
-                
-            cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_job_recruiter_recruiter_id 
-                    ON job_recruiter_assignments(recruiter_id)
-                """)
-                
-                # Create view for easier access to joined data
-            cursor.execute("""
-                    CREATE OR REPLACE VIEW job_recruiter_view AS
-                    SELECT 
-                        a.id,
-                        a.job_id,
-                        a.recruiter_id,
-                        a.assigned_date,
-                        j.title AS job_title,
-                        r.name AS recruiter_name,
-                        j.company AS company
-                    FROM 
-                        job_recruiter_assignments a
-                    JOIN 
-                        job_descriptions j ON a.job_id = j.id
-                    JOIN 
-                        recruiters r ON a.recruiter_id = r.id
-                """)
-    finally:
-        cursor.close()
-        conn.close()
 
-def create_tables():
+@contextmanager
+def db_connection():
+    """Context manager yielding a pooled connection that is always returned to the pool"""
     conn = get_db_connection()
-    cur = conn.cursor()
     try:
-        # Create the table directly in the tres database (no schema needed)
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS job_skill_ratings (
-            id SERIAL PRIMARY KEY,
-            job_id INTEGER NOT NULL,
-            skill_name VARCHAR(255) NOT NULL,
-            rating INTEGER NOT NULL,
-            is_required BOOLEAN NOT NULL
-        )
-        """)
-        conn.commit()  # Commit the table creation
-    except Exception as e:
-        print(f"Error creating table: {e}")
-        conn.rollback()  # Rollback on error
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
     finally:
-        cur.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
@@ -0,0 +1,56 @@
+# import_jobs.py
+"""
+Bulk import of job descriptions from NDJSON or CSV.
+
+Each record must match JobDescriptionCreate. In CSV files the list columns
+(required_skills, preferred_skills, benefits) hold ';'-separated values or a
+JSON array. Rows are validated and loaded through COPY in batches; invalid
+rows are reported and skipped:
+
+    python import_jobs.py postings.ndjson
+    python import_jobs.py postings.csv --batch-size 5000 --errors errors.ndjson
+"""
+import argparse
+import json
+import sys
+import time
+from config import IMPORT_BATCH_SIZE
+from utils.bulk_import import detect_format, import_job_descriptions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import job descriptions from NDJSON or CSV")
+    parser.add_argument("path", help="file to import, or - for stdin")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--errors", help="write the per-row errors to this NDJSON file")
+    args = parser.parse_args()
+
+    fmt = detect_format(args.path, args.format or ("ndjson" if args.path == "-" else None))
+    start = time.perf_counter()
+
+    def progress(summary):
+        rate = summary["total"] / max(time.perf_counter() - start, 1e-9)
+        print(f"{summary['total']} rows read, {summary['imported']} imported, "
+              f"{summary['failed']} failed ({rate:.0f} rows/s)", file=sys.stderr)
+
+    if args.path == "-":
+        summary = import_job_descriptions(sys.stdin, fmt, args.batch_size, progress)
+    else:
+        with open(args.path, encoding="utf-8-sig", newline="") as lines:
+            summary = import_job_descriptions(lines, fmt, args.batch_size, progress)
+
+    if args.errors:
+        with open(args.errors, "w", encoding="utf-8") as errors_file:
+            for error in summary["errors"]:
+                errors_file.write(json.dumps(error) + "\n")
+    else:
+        for error in summary["errors"]:
+            print(f"row {error['row']}: {error['error']}", file=sys.stderr)
+
+    print(json.dumps({key: summary[key] for key in ("total", "imported", "failed")}))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
+import anyio.to_thread
 from dotenv import load_dotenv
 import google.generativeai as genai
 import os
 # Import routers
-from routers import job_descriptions, job_skills, recruiters, stats, assignment, resume
-from database import init_db, create_tables
+from routers import job_descriptions, job_skills, recruiters, stats, assignment, resume, metrics
+from database import db_connection, close_pool
+from migrations import run_migrations
+from config import API_THREADPOOL_SIZE, MAX_UPLOAD_BYTES, ANALYZE_BATCH_MAX_BYTES
+from utils.document_processor import shutdown_executors
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils.upload_limit import UploadLimitMiddleware, MULTIPART_OVERHEAD_BYTES
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +28,17 @@ genai.configure(api_key=GOOGLE_API_KEY)
 # Create FastAPI app
 app = FastAPI(title="Job Description Analyzer API")
 
+# Refuse oversized document uploads while they arrive, before they are spooled.
+# Added before CORS so the CORS middleware wraps it and early 413s carry CORS headers
+app.add_middleware(
+    UploadLimitMiddleware,
+    limits={
+        "/api/job-descriptions/analyze": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/api/job-descriptions/analyze/tasks": MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/api/job-descriptions/analyze/batch": ANALYZE_BATCH_MAX_BYTES,
+    },
+)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +46,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Include routers
@@ -38,22 +56,21 @@ app.include_router(recruiters.router)
 app.include_router(stats.router)
 app.include_router(assignment.router)
 app.include_router(resume.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 async def root():
     return {"message": "Job Description Analyzer API is running"}
 
 @app.get("/api/health")
-async def health_check():
+def health_check():
     """API health check endpoint"""
     # Check database connection
     try:
-        from config import get_db_connection
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        cursor.close()
-        conn.close()
+        # Returns the connection to the pool even when the query fails
+        with db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
         db_status = "connected"
     except Exception as e:
         db_status = f"error: {str(e)}"
@@ -64,16 +81,23 @@ async def health_check():
         "version": "1.0.0"
     }
 
-# Initialize database on startup
+# Bring the database schema up to date on startup
 @app.on_event("startup")
 async def startup_event():
+    # Blocking database work runs in this thread pool so it never stalls the event loop
+    anyio.to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+
     try:
-        init_db()
-        create_tables()
-        print("Database initialized successfully")
+        version = run_migrations()
+        print(f"Database schema at version {version}")
     except Exception as e:
         print(f"Error initializing database: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_executors()
+    close_pool()
+
 # Run the application
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,705 @@
+# migrations.py
+"""
+Versioned schema migrations.
+
+Each migration is a function of an open cursor, listed in MIGRATIONS with its
+version. run_migrations() applies the ones newer than the version recorded in
+schema_migrations, each in its own transaction, under an advisory lock so
+concurrently starting API workers never race. When the schema is current it
+costs one query and runs no DDL.
+
+To change the schema, append a new function and MIGRATIONS entry; never edit
+one that has shipped. Apply pending migrations by hand with:
+
+    python migrations.py
+"""
+import psycopg2
+from psycopg2.extras import execute_values
+from database import get_db_connection
+from utils.skills import seed_skill_aliases, resolve_skill_ids
+
+# Key for pg_advisory_lock serializing migration runs across processes
+MIGRATION_LOCK_ID = 72_410_019
+
+# Key for the transaction-level advisory lock every rollup trigger takes first
+ROLLUP_LOCK_ID = 72_410_020
+
+# Distinct legacy skill names resolved per statement when migrating
+SKILL_MIGRATION_BATCH = 5000
+
+
+def migrate_skill_names(cursor, table, column):
+    """Move a legacy free-text skill column of `table` onto skill_id and drop it"""
+    cursor.execute("""
+    SELECT 1 FROM information_schema.columns WHERE table_name = %s AND column_name = %s
+    """, (table, column))
+    if not cursor.fetchone():
+        return
+
+    print(f"Migrating {table}.{column} to the skills dictionary")
+    cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS skill_id INTEGER REFERENCES skills(id)")
+    cursor.execute(f"SELECT DISTINCT {column} AS name FROM {table}")
+    names = [row["name"] for row in cursor.fetchall()]
+
+    for start in range(0, len(names), SKILL_MIGRATION_BATCH):
+        skill_ids = resolve_skill_ids(cursor, names[start:start + SKILL_MIGRATION_BATCH])
+        if skill_ids:
+            execute_values(cursor, f"""
+            UPDATE {table} t SET skill_id = v.skill_id
+            FROM (VALUES %s) AS v(name, skill_id)
+            WHERE t.{column} = v.name
+            """, list(skill_ids.items()), page_size=len(skill_ids))
+
+    # Blank names have no skill; spellings that now resolve to the same skill collapse to one row,
+    # keeping the required one, then the oldest
+    cursor.execute(f"DELETE FROM {table} WHERE skill_id IS NULL")
+    cursor.execute(f"""
+    DELETE FROM {table} a USING {table} b
+    WHERE a.job_id = b.job_id AND a.skill_id = b.skill_id
+      AND (a.is_required, b.id) < (b.is_required, a.id)
+    """)
+    cursor.execute(f"ALTER TABLE {table} ALTER COLUMN skill_id SET NOT NULL")
+    cursor.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+
+
+def baseline_schema(cursor):
+    """Every table, as previously created by init_db()/create_tables(); adopts databases they set up"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS job_descriptions (
+        id SERIAL PRIMARY KEY,
+        title VARCHAR(255) NOT NULL,
+        company VARCHAR(255) NOT NULL,
+        location VARCHAR(255) NOT NULL,
+        description TEXT NOT NULL,
+        experience_required VARCHAR(255),
+        education_required TEXT,
+        job_type VARCHAR(100),
+        salary_range VARCHAR(255),
+        application_url TEXT,
+        contact_email VARCHAR(255),
+        date_posted VARCHAR(100),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    # Full-text search over title (weighted higher) and description, kept current by Postgres
+    cursor.execute("""
+    ALTER TABLE job_descriptions ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """)
+
+    # The skill dictionary: one row per canonical skill, plus alternative spellings
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS skills (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        normalized_name VARCHAR(255) NOT NULL UNIQUE
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS skill_aliases (
+        alias VARCHAR(255) PRIMARY KEY,
+        skill_id INTEGER NOT NULL REFERENCES skills(id) ON DELETE CASCADE
+    )
+    """)
+    seed_skill_aliases(cursor)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS job_skills (
+        id SERIAL PRIMARY KEY,
+        job_id INTEGER REFERENCES job_descriptions(id) ON DELETE CASCADE,
+        skill_id INTEGER NOT NULL REFERENCES skills(id),
+        is_required BOOLEAN NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    migrate_skill_names(cursor, "job_skills", "skill")
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS job_benefits (
+        id SERIAL PRIMARY KEY,
+        job_id INTEGER REFERENCES job_descriptions(id) ON DELETE CASCADE,
+        benefit TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS job_skill_ratings (
+        id SERIAL PRIMARY KEY,
+        job_id INTEGER NOT NULL,
+        skill_id INTEGER NOT NULL REFERENCES skills(id),
+        rating INTEGER NOT NULL,
+        is_required BOOLEAN NOT NULL
+    )
+    """)
+    migrate_skill_names(cursor, "job_skill_ratings", "skill_name")
+
+    # Analysis task queue (consumed by worker.py)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS analysis_tasks (
+        id UUID PRIMARY KEY,
+        filename VARCHAR(255) NOT NULL,
+        content BYTEA,
+        status VARCHAR(20) NOT NULL DEFAULT 'queued',
+        progress INTEGER NOT NULL DEFAULT 0,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        job_id INTEGER REFERENCES job_descriptions(id) ON DELETE SET NULL,
+        result JSONB,
+        error TEXT,
+        locked_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_analysis_tasks_pending
+    ON analysis_tasks(created_at) WHERE status IN ('queued', 'processing')
+    """)
+
+    # Gemini extraction cache (see utils/extraction_cache.py)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS extraction_cache (
+        cache_key VARCHAR(128) PRIMARY KEY,
+        result JSONB NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_used
+    ON extraction_cache(last_used_at)
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS recruiters (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        email VARCHAR(255),
+        phone VARCHAR(50),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Jd_Resume_Final_feedback (
+        id SERIAL PRIMARY KEY,
+        Jd_id VARCHAR(255) NOT NULL,
+        resume1 VARCHAR(255) NOT NULL,
+        resume2 VARCHAR(255) NOT NULL,
+        Final_Feedback TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS job_recruiter_assignments (
+        id SERIAL PRIMARY KEY,
+        job_id INTEGER NOT NULL,
+        recruiter_id INTEGER NOT NULL,
+        assigned_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT fk_job
+            FOREIGN KEY(job_id)
+            REFERENCES job_descriptions(id)
+            ON DELETE CASCADE,
+        CONSTRAINT fk_recruiter
+            FOREIGN KEY(recruiter_id)
+            REFERENCES recruiters(id)
+            ON DELETE CASCADE,
+        CONSTRAINT unique_job_recruiter UNIQUE (job_id, recruiter_id)
+    )
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_recruiter_job_id
+    ON job_recruiter_assignments(job_id)
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_recruiter_recruiter_id
+    ON job_recruiter_assignments(recruiter_id)
+    """)
+
+    # View for easier access to joined data
+    cursor.execute("""
+    CREATE OR REPLACE VIEW job_recruiter_view AS
+    SELECT
+        a.id,
+        a.job_id,
+        a.recruiter_id,
+        a.assigned_date,
+        j.title AS job_title,
+        r.name AS recruiter_name,
+        j.company AS company
+    FROM
+        job_recruiter_assignments a
+    JOIN
+        job_descriptions j ON a.job_id = j.id
+    JOIN
+        recruiters r ON a.recruiter_id = r.id
+    """)
+
+
+def hot_path_indexes(cursor):
+    """Indexes behind the detail, list, ratings and stats queries"""
+    # Skills and ratings are looked up per job, and a job lists each skill once;
+    # the (job_id, skill_id) unique indexes also serve plain job_id lookups
+    cursor.execute("DROP INDEX IF EXISTS idx_job_skills_job_id")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_job_skills_job_skill ON job_skills(job_id, skill_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_skills_skill_id ON job_skills(skill_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_benefits_job_id ON job_benefits(job_id)")
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_job_skill_ratings_job_skill ON job_skill_ratings(job_id, skill_id)
+    """)
+
+    # Recent jobs and per-month stats sort and filter on created_at
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_descriptions_created_at ON job_descriptions(created_at)")
+
+
+def search_indexes(cursor):
+    """Full-text and trigram indexes for /api/job-descriptions/search"""
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_descriptions_search
+    ON job_descriptions USING GIN (search_vector)
+    """)
+
+    # Trigram indexes serve the substring (ILIKE '%term%') filters; skipped if pg_trgm is unavailable
+    cursor.execute("SAVEPOINT trigram_indexes")
+    try:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except psycopg2.Error as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT trigram_indexes")
+        print(f"pg_trgm unavailable, search filters will scan: {e}")
+        return
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_descriptions_company_trgm
+    ON job_descriptions USING GIN (company gin_trgm_ops)
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_descriptions_location_trgm
+    ON job_descriptions USING GIN (location gin_trgm_ops)
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_skills_name_trgm
+    ON skills USING GIN (name gin_trgm_ops)
+    """)
+    cursor.execute("RELEASE SAVEPOINT trigram_indexes")
+
+
+# One (facet, value) row per counted attribute of a job row `c`; shared by the trigger and the backfill
+JOB_FACETS = """
+    CROSS JOIN LATERAL (VALUES
+        ('company', c.company),
+        ('location', c.location),
+        ('job_type', c.job_type),
+        ('experience', c.experience_required),
+        ('education', c.education_required),
+        ('month', to_char(c.created_at, 'YYYY-MM'))
+    ) AS f(facet, value)
+    WHERE f.value IS NOT NULL
+"""
+
+
+def analytics_rollups(cursor):
+    """
+    Counts behind /stats and /dashboard-summary, kept current by triggers.
+
+    job_facet_counts holds jobs per company, location, job type, experience,
+    education and creation month; job_rollup_totals the job count and the
+    number of distinct values per facet; skill_counts jobs per skill. Statement
+    triggers fold each write's transition tables into them, so a bulk import
+    costs one rollup update per statement rather than per row.
+
+    Every writer already queues on the shared job total until it commits, so
+    the triggers first take one transaction-level advisory lock: transactions
+    touching several counter rows across statements then wait on each other in
+    a single place instead of deadlocking.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS job_facet_counts (
+        facet VARCHAR(32) NOT NULL,
+        value TEXT NOT NULL,
+        job_count BIGINT NOT NULL
+    )
+    """)
+    # Keyed on a hash because education values can outgrow a btree entry
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_job_facet_counts_value ON job_facet_counts(facet, md5(value))
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_facet_counts_top ON job_facet_counts(facet, job_count DESC)")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS job_rollup_totals (
+        name VARCHAR(32) PRIMARY KEY,
+        total BIGINT NOT NULL
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS skill_counts (
+        skill_id INTEGER NOT NULL REFERENCES skills(id) ON DELETE CASCADE,
+        is_required BOOLEAN NOT NULL,
+        job_count BIGINT NOT NULL,
+        PRIMARY KEY (skill_id, is_required)
+    )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_skill_counts_top ON skill_counts(is_required, job_count DESC)")
+
+    # Rows whose count crosses zero change their facet's distinct total; rows left at zero
+    # stay in place (readers skip them) and are reused if the value comes back
+    cursor.execute("""
+    CREATE OR REPLACE FUNCTION rollup_job_facets() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        columns TEXT := 'company, location, job_type, experience_required, education_required, created_at';
+        changes TEXT := CASE TG_OP
+            WHEN 'INSERT' THEN format('SELECT %1$s, 1 AS delta FROM new_rows', columns)
+            WHEN 'DELETE' THEN format('SELECT %1$s, -1 AS delta FROM old_rows', columns)
+            ELSE format('SELECT %1$s, 1 AS delta FROM new_rows UNION ALL SELECT %1$s, -1 FROM old_rows', columns)
+        END;
+    BEGIN
+        PERFORM pg_advisory_xact_lock(""" + str(ROLLUP_LOCK_ID) + """);
+        EXECUTE format($sql$
+        WITH changes AS (%s),
+        deltas AS (
+            SELECT f.facet, f.value, SUM(c.delta) AS delta
+            FROM changes c
+            """ + JOB_FACETS + """
+            GROUP BY f.facet, f.value
+            HAVING SUM(c.delta) <> 0
+        ),
+        applied AS (
+            INSERT INTO job_facet_counts (facet, value, job_count)
+            SELECT facet, value, delta FROM deltas ORDER BY facet, value
+            ON CONFLICT (facet, md5(value)) DO UPDATE SET job_count = job_facet_counts.job_count + EXCLUDED.job_count
+            RETURNING facet, value, job_count
+        ),
+        totals AS (
+            SELECT 'jobs' AS name, SUM(delta) AS delta FROM changes
+            UNION ALL
+            SELECT a.facet, SUM(CASE
+                WHEN a.job_count > 0 AND a.job_count - d.delta <= 0 THEN 1
+                WHEN a.job_count <= 0 AND a.job_count - d.delta > 0 THEN -1
+                ELSE 0
+            END)
+            FROM applied a JOIN deltas d ON d.facet = a.facet AND d.value = a.value
+            GROUP BY a.facet
+        )
+        INSERT INTO job_rollup_totals (name, total)
+        SELECT name, delta FROM totals WHERE delta <> 0 ORDER BY name
+        ON CONFLICT (name) DO UPDATE SET total = job_rollup_totals.total + EXCLUDED.total
+        $sql$, changes);
+        RETURN NULL;
+    END
+    $$
+    """)
+    cursor.execute("""
+    CREATE OR REPLACE FUNCTION rollup_job_skills() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        changes TEXT := CASE TG_OP
+            WHEN 'INSERT' THEN 'SELECT skill_id, is_required, 1 AS delta FROM new_rows'
+            WHEN 'DELETE' THEN 'SELECT skill_id, is_required, -1 AS delta FROM old_rows'
+            ELSE 'SELECT skill_id, is_required, 1 AS delta FROM new_rows
+                  UNION ALL SELECT skill_id, is_required, -1 FROM old_rows'
+        END;
+    BEGIN
+        PERFORM pg_advisory_xact_lock(""" + str(ROLLUP_LOCK_ID) + """);
+        EXECUTE format($sql$
+        INSERT INTO skill_counts (skill_id, is_required, job_count)
+        SELECT skill_id, is_required, SUM(delta) FROM (%s) c
+        GROUP BY skill_id, is_required
+        HAVING SUM(delta) <> 0
+        ORDER BY skill_id, is_required
+        ON CONFLICT (skill_id, is_required) DO UPDATE SET job_count = skill_counts.job_count + EXCLUDED.job_count
+        $sql$, changes);
+        RETURN NULL;
+    END
+    $$
+    """)
+
+    # No writes may land between the backfill and the triggers taking over
+    cursor.execute("LOCK TABLE job_descriptions, job_skills IN SHARE ROW EXCLUSIVE MODE")
+    for table, function in (("job_descriptions", "rollup_job_facets"), ("job_skills", "rollup_job_skills")):
+        for event, transitions in (
+            ("INSERT", "NEW TABLE AS new_rows"),
+            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("DELETE", "OLD TABLE AS old_rows"),
+        ):
+            trigger = f"{table}_rollup_{event.lower()}"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+            cursor.execute(f"""
+            CREATE TRIGGER {trigger} AFTER {event} ON {table}
+            REFERENCING {transitions}
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+            """)
+
+    cursor.execute("TRUNCATE job_facet_counts, job_rollup_totals, skill_counts")
+    cursor.execute("""
+    INSERT INTO job_facet_counts (facet, value, job_count)
+    SELECT f.facet, f.value, COUNT(*) FROM job_descriptions c
+    """ + JOB_FACETS + """
+    GROUP BY f.facet, f.value
+    """)
+    cursor.execute("""
+    INSERT INTO job_rollup_totals (name, total)
+    SELECT 'jobs', COUNT(*) FROM job_descriptions
+    UNION ALL
+    SELECT facet, COUNT(*) FROM job_facet_counts GROUP BY facet
+    """)
+    cursor.execute("""
+    INSERT INTO skill_counts (skill_id, is_required, job_count)
+    SELECT skill_id, is_required, COUNT(*) FROM job_skills GROUP BY skill_id, is_required
+    """)
+
+
+def create_rollup_triggers(cursor, table, name, function):
+    """(Re)create statement-level insert/update/delete triggers on table passing transition tables to function"""
+    for event, transitions in (
+        ("INSERT", "NEW TABLE AS new_rows"),
+        ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+        ("DELETE", "OLD TABLE AS old_rows"),
+    ):
+        trigger = f"{table}_{name}_{event.lower()}"
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+        cursor.execute(f"""
+        CREATE TRIGGER {trigger} AFTER {event} ON {table}
+        REFERENCING {transitions}
+        FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+        """)
+
+
+def skill_monthly_rollup(cursor):
+    """
+    skill_monthly_counts: jobs listing each skill per month (of job_skills.created_at), split by
+    required/preferred, kept current by a statement trigger on job_skills like skill_counts
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS skill_monthly_counts (
+        month DATE NOT NULL,
+        skill_id INTEGER NOT NULL REFERENCES skills(id) ON DELETE CASCADE,
+        required_count BIGINT NOT NULL,
+        preferred_count BIGINT NOT NULL,
+        PRIMARY KEY (month, skill_id)
+    )
+    """)
+    # Newest months first, busiest skills first within a month
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_skill_monthly_counts_top
+    ON skill_monthly_counts(month, (required_count + preferred_count))
+    """)
+
+    cursor.execute("""
+    CREATE OR REPLACE FUNCTION rollup_skill_months() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        columns TEXT := 'date_trunc(''month'', created_at)::date AS month, skill_id, is_required';
+        changes TEXT := CASE TG_OP
+            WHEN 'INSERT' THEN format('SELECT %1$s, 1 AS delta FROM new_rows', columns)
+            WHEN 'DELETE' THEN format('SELECT %1$s, -1 AS delta FROM old_rows', columns)
+            ELSE format('SELECT %1$s, 1 AS delta FROM new_rows UNION ALL SELECT %1$s, -1 FROM old_rows', columns)
+        END;
+    BEGIN
+        PERFORM pg_advisory_xact_lock(""" + str(ROLLUP_LOCK_ID) + """);
+        EXECUTE format($sql$
+        INSERT INTO skill_monthly_counts (month, skill_id, required_count, preferred_count)
+        SELECT month, skill_id,
+               COALESCE(SUM(delta) FILTER (WHERE is_required), 0),
+               COALESCE(SUM(delta) FILTER (WHERE NOT is_required), 0)
+        FROM (%s) c
+        WHERE month IS NOT NULL
+        GROUP BY month, skill_id
+        HAVING SUM(delta) FILTER (WHERE is_required) <> 0 OR SUM(delta) FILTER (WHERE NOT is_required) <> 0
+        ORDER BY month, skill_id
+        ON CONFLICT (month, skill_id) DO UPDATE SET
+            required_count = skill_monthly_counts.required_count + EXCLUDED.required_count,
+            preferred_count = skill_monthly_counts.preferred_count + EXCLUDED.preferred_count
+        $sql$, changes);
+        RETURN NULL;
+    END
+    $$
+    """)
+
+    cursor.execute("LOCK TABLE job_skills IN SHARE ROW EXCLUSIVE MODE")
+    create_rollup_triggers(cursor, "job_skills", "months", "rollup_skill_months")
+    cursor.execute("TRUNCATE skill_monthly_counts")
+    cursor.execute("""
+    INSERT INTO skill_monthly_counts (month, skill_id, required_count, preferred_count)
+    SELECT date_trunc('month', created_at)::date, skill_id,
+           COUNT(*) FILTER (WHERE is_required), COUNT(*) FILTER (WHERE NOT is_required)
+    FROM job_skills
+    WHERE created_at IS NOT NULL
+    GROUP BY 1, 2
+    """)
+
+
+def salary_columns(cursor):
+    """Salary parsed from salary_range at write time (utils/salary.py); existing rows via backfill_salaries.py"""
+    cursor.execute("""
+    ALTER TABLE job_descriptions
+        ADD COLUMN IF NOT EXISTS salary_min NUMERIC(14, 2),
+        ADD COLUMN IF NOT EXISTS salary_max NUMERIC(14, 2),
+        ADD COLUMN IF NOT EXISTS salary_currency VARCHAR(3),
+        ADD COLUMN IF NOT EXISTS salary_period VARCHAR(10)
+    """)
+    # Covers /salary-analysis: only jobs with a parsed salary, grouped columns first
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_job_descriptions_salary
+    ON job_descriptions(salary_currency, salary_period, job_type, experience_required)
+    INCLUDE (salary_min, salary_max)
+    WHERE salary_min IS NOT NULL OR salary_max IS NOT NULL
+    """)
+
+
+# Tables whose writes bump their row in table_versions (read by utils/etag.py)
+VERSIONED_TABLES = ["job_descriptions", "job_skills", "skills", "job_benefits", "recruiters", "job_recruiter_assignments"]
+
+
+def table_versions(cursor):
+    """
+    table_versions: a counter per table in VERSIONED_TABLES, bumped by a statement trigger on
+    every insert, update, delete or truncate. The bump commits with the write, so a reader never
+    sees a new version before the data it stands for.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name VARCHAR(63) PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0
+    )
+    """)
+    # Writers queue on the version row until they commit; taking the rollup lock first keeps
+    # transactions that write several of these tables from deadlocking on the rows
+    cursor.execute("""
+    CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        PERFORM pg_advisory_xact_lock(""" + str(ROLLUP_LOCK_ID) + """);
+        UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+        RETURN NULL;
+    END
+    $$
+    """)
+    execute_values(cursor, """
+    INSERT INTO table_versions (table_name) VALUES %s ON CONFLICT (table_name) DO NOTHING
+    """, [(table,) for table in VERSIONED_TABLES])
+    for table in VERSIONED_TABLES:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {table}_version ON {table}")
+        cursor.execute(f"""
+        CREATE TRIGGER {table}_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()
+        """)
+
+
+def task_claim_tokens(cursor):
+    """analysis_tasks.claim_token: set by each claim, so a reclaimed task ignores its previous worker (utils/task_queue.py)"""
+    cursor.execute("ALTER TABLE analysis_tasks ADD COLUMN IF NOT EXISTS claim_token UUID")
+
+
+def skill_alias_trigram_index(cursor):
+    """Trigram index for the search skill filter's ILIKE over skill_aliases.alias; skipped without pg_trgm"""
+    cursor.execute("SAVEPOINT trigram_indexes")
+    try:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except psycopg2.Error as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT trigram_indexes")
+        print(f"pg_trgm unavailable, the search skill filter will scan skill_aliases: {e}")
+        return
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_skill_aliases_alias_trgm
+    ON skill_aliases USING GIN (alias gin_trgm_ops)
+    """)
+    cursor.execute("RELEASE SAVEPOINT trigram_indexes")
+
+
+def table_versions_unlocked(cursor):
+    """
+    Drop the rollup advisory lock from bump_table_version(): the row lock on each table's counter
+    already serializes its bumps, so recruiter and assignment writes no longer queue behind job
+    writes. Counters are still locked in a fixed order per transaction: job_descriptions and
+    job_skills writes take the rollup lock in their rollup triggers (which fire before the version
+    trigger), and recruiter deletes cascade to job_recruiter_assignments before bumping recruiters.
+    """
+    cursor.execute("""
+    CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+        RETURN NULL;
+    END
+    $$
+    """)
+
+
+# (version, name, function) in the order they apply
+MIGRATIONS = [
+    (1, "baseline_schema", baseline_schema),
+    (2, "hot_path_indexes", hot_path_indexes),
+    (3, "search_indexes", search_indexes),
+    (4, "analytics_rollups", analytics_rollups),
+    (5, "skill_monthly_rollup", skill_monthly_rollup),
+    (6, "salary_columns", salary_columns),
+    (7, "table_versions", table_versions),
+    (8, "task_claim_tokens", task_claim_tokens),
+    (9, "skill_alias_trigram_index", skill_alias_trigram_index),
+    (10, "table_versions_unlocked", table_versions_unlocked),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(cursor):
+    """Highest applied migration version, 0 for a database that has never been migrated"""
+    cursor.execute("SELECT to_regclass('schema_migrations') IS NOT NULL AS migrated")
+    if not cursor.fetchone()["migrated"]:
+        return 0
+    cursor.execute("SELECT COALESCE(MAX(version), 0) AS version FROM schema_migrations")
+    return cursor.fetchone()["version"]
+
+
+def run_migrations():
+    """Apply pending migrations; returns the schema version afterwards"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        version = current_version(cursor)
+        conn.commit()
+        if version >= LATEST_VERSION:
+            return version
+
+        # Another process may be migrating; wait for it, then re-read where it got to
+        cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+        try:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+            conn.commit()
+            version = current_version(cursor)
+
+            for migration_version, name, migrate in MIGRATIONS:
+                if migration_version <= version:
+                    continue
+                print(f"Applying migration {migration_version:04d}_{name}")
+                try:
+                    migrate(cursor)
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (migration_version, name)
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                version = migration_version
+
+            return version
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+            conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    print(f"Schema at version {run_migrations()}")
@@ -22,6 +22,41 @@ class JobDescriptionCreate(BaseModel):
 class JobDescriptionResponse(JobDescriptionCreate):
     id: int
 
+class AnalysisTaskResponse(BaseModel):
+    task_id: str
+    status: str
+    progress: int
+    attempts: int = 0
+    filename: Optional[str] = None
+    job_id: Optional[int] = None
+    error: Optional[str] = None
+    result: Optional[JobDescriptionResponse] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class BatchAnalysisItem(BaseModel):
+    filename: str
+    status: str
+    id: Optional[int] = None
+    error: Optional[str] = None
+    job: Optional[JobDescriptionResponse] = None
+
+class BatchAnalysisResponse(BaseModel):
+    total: int
+    saved: int
+    failed: int
+    results: List[BatchAnalysisItem]
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ImportResponse(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+
 class SkillRatingRequest(BaseModel):
     job_id: int
     required_skills: Dict[str, int]
@@ -1,7 +1,7 @@
 # routers/recruiters.py
 from fastapi import APIRouter, HTTPException
 from models import Assignment, AssignmentUpdate, AssignmentCreate
-from database import get_db_connection
+from database import db_connection
 from pydantic import BaseModel
 from datetime import datetime
 import psycopg2
@@ -9,15 +9,20 @@ from psycopg2.extras import RealDictCursor
 from fastapi import FastAPI, HTTPException, Depends
 from typing import List, Optional
 from contextlib import contextmanager
+from utils.etag import conditional_get
 
 
 router = APIRouter(
     prefix="",
 )
 
-@router.get("/api/job-recruiter-assignments", response_model=List[Assignment])
-async def get_all_assignments():
-    with get_db_connection() as conn:
+@router.get(
+    "/api/job-recruiter-assignments",
+    response_model=List[Assignment],
+    dependencies=[Depends(conditional_get("job_recruiter_assignments", "job_descriptions", "recruiters"))]
+)
+def get_all_assignments():
+    with db_connection() as conn:
         with conn.cursor() as cur:
             cur.execute("""
                 SELECT * FROM job_recruiter_view
@@ -27,8 +32,8 @@ async def get_all_assignments():
             return assignments
 
 @router.get("/api/job-recruiter-assignments/job/{job_id}", response_model=List[Assignment])
-async def get_assignments_by_job(job_id: int):
-    with get_db_connection() as conn:
+def get_assignments_by_job(job_id: int):
+    with db_connection() as conn:
         with conn.cursor() as cur:
             cur.execute("""
                 SELECT * FROM job_recruiter_view
@@ -38,8 +43,8 @@ async def get_assignments_by_job(job_id: int):
             return assignments
 
 @router.post("/api/job-recruiter-assignments", response_model=Assignment)
-async def create_assignment(assignment: AssignmentCreate):
-    with get_db_connection() as conn:
+def create_assignment(assignment: AssignmentCreate):
+    with db_connection() as conn:
         with conn.cursor() as cur:
             try:
                 # Check if assignment already exists
@@ -86,8 +91,8 @@ async def create_assignment(assignment: AssignmentCreate):
                 raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
 @router.put("/api/job-recruiter-assignments/{assignment_id}", response_model=Assignment)
-async def update_assignment(assignment_id: int, assignment: AssignmentUpdate):
-    with get_db_connection() as conn:
+def update_assignment(assignment_id: int, assignment: AssignmentUpdate):
+    with db_connection() as conn:
         with conn.cursor() as cur:
             try:
                 cur.execute("""
@@ -117,8 +122,8 @@ async def update_assignment(assignment_id: int, assignment: AssignmentUpdate):
                 raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
 @router.delete("/api/job-recruiter-assignments/{assignment_id}")
-async def delete_assignment(assignment_id: int):
-    with get_db_connection() as conn:
+def delete_assignment(assignment_id: int):
+    with db_connection() as conn:
         with conn.cursor() as cur:
             cur.execute("""
                 DELETE FROM job_recruiter_assignments 
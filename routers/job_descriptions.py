@@ -1,71 +1,136 @@
 # routers/job_descriptions.py
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional
-import tempfile
-import shutil
 import os
-from models import JobDescriptionCreate, JobDescriptionResponse
+import io
+import asyncio
+import hashlib
+from uuid import UUID
+from psycopg2.extras import execute_values
+from models import (
+    JobDescriptionCreate, JobDescriptionResponse, AnalysisTaskResponse, BatchAnalysisResponse, ImportResponse
+)
 from database import get_db_connection
+from config import ANALYZE_BATCH_CONCURRENCY, ANALYZE_BATCH_MAX_FILES, MAX_UPLOAD_BYTES
 from utils.document_processor import DocumentProcessor
+from utils.gemini_client import GeminiUnavailable
+from utils.task_queue import enqueue_analysis, get_task
+from utils.bulk_import import detect_format, import_job_descriptions
+from utils.pagination import decode_cursor, set_next_cursor
+from utils.response_cache import stats_cache
+from utils.skills import insert_job_skills
+from utils.salary import parse_salary
+from utils.etag import conditional_get
 
 router = APIRouter(
     prefix="",
     tags=["job_descriptions"]
 )
 
+# Function to insert a job description and its skills/benefits on an open cursor
+def insert_job_description(cursor, job_data):
+    # Insert job description
+    salary = parse_salary(job_data["salary_range"])
+    cursor.execute("""
+    INSERT INTO job_descriptions (
+        title, company, location, description, experience_required,
+        education_required, job_type, salary_range, application_url,
+        contact_email, date_posted, salary_min, salary_max, salary_currency, salary_period
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    RETURNING id
+    """, (
+        job_data["title"],
+        job_data["company"],
+        job_data["location"],
+        job_data["description"],
+        job_data["experience_required"],
+        job_data["education_required"],
+        job_data["job_type"],
+        job_data["salary_range"],
+        job_data["application_url"],
+        job_data["contact_email"],
+        job_data["date_posted"],
+        salary["salary_min"],
+        salary["salary_max"],
+        salary["salary_currency"],
+        salary["salary_period"]
+    ))
+    
+    job_id = cursor.fetchone()["id"]
+    
+    insert_job_children(
+        cursor, job_id, job_data["required_skills"], job_data["preferred_skills"], job_data["benefits"]
+    )
+    
+    return job_id
+
+# Function to write a job's skills and benefits with one multi-row INSERT per table
+def insert_job_children(cursor, job_id, required_skills, preferred_skills, benefits):
+    # Skills are resolved against the skill dictionary in the same statement that inserts them
+    insert_job_skills(cursor, job_id, required_skills, preferred_skills)
+    
+    benefit_rows = [(job_id, benefit) for benefit in benefits or []]
+    if benefit_rows:
+        execute_values(cursor, """
+        INSERT INTO job_benefits (job_id, benefit) VALUES %s
+        """, benefit_rows, page_size=len(benefit_rows))
+
+# A job description row with its skills and benefits folded in, so one statement returns the full response shape
+JOB_DETAIL_COLUMNS = """
+    jd.id, jd.title, jd.company, jd.location, jd.description, jd.experience_required,
+    jd.education_required, jd.job_type, jd.salary_range, jd.application_url,
+    jd.contact_email, jd.date_posted, jd.created_at,
+    ARRAY(
+        SELECT s.name FROM job_skills js JOIN skills s ON s.id = js.skill_id
+        WHERE js.job_id = jd.id AND js.is_required = TRUE ORDER BY js.id
+    ) AS required_skills,
+    ARRAY(
+        SELECT s.name FROM job_skills js JOIN skills s ON s.id = js.skill_id
+        WHERE js.job_id = jd.id AND js.is_required = FALSE ORDER BY js.id
+    ) AS preferred_skills,
+    ARRAY(SELECT benefit FROM job_benefits WHERE job_id = jd.id ORDER BY id) AS benefits
+"""
+
+# Function to fetch job descriptions in their response shape with a single query
+def select_job_descriptions(
+    cursor, where="", params=(), order_by="jd.id DESC", limit=None, offset=0, columns="", from_items=""
+):
+    sql_query = "SELECT " + JOB_DETAIL_COLUMNS + columns + " FROM job_descriptions jd" + from_items
+    params = list(params)
+    if where:
+        sql_query += " WHERE " + where
+    sql_query += " ORDER BY " + order_by
+    if limit is not None:
+        sql_query += " LIMIT %s OFFSET %s"
+        params.extend([limit, offset])
+    
+    cursor.execute(sql_query, params)
+    return [dict(row) for row in cursor.fetchall()]
+
+# Function to turn a ?cursor= value into its typed keyset values, e.g. cursor_position(after, id=int)
+def cursor_position(after, **types):
+    try:
+        position = decode_cursor(after)
+        return [convert(position[key]) for key, convert in types.items()]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def job_position(job):
+    return {"id": job["id"]}
+
+def ranked_job_position(job):
+    return {"rank": job["rank"], "id": job["id"]}
+
 # Function to save job description to PostgreSQL
 def save_job_description(job_data):
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # Insert job description
-        cursor.execute("""
-        INSERT INTO job_descriptions (
-            title, company, location, description, experience_required,
-            education_required, job_type, salary_range, application_url,
-            contact_email, date_posted
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING id
-        """, (
-            job_data["title"],
-            job_data["company"],
-            job_data["location"],
-            job_data["description"],
-            job_data["experience_required"],
-            job_data["education_required"],
-            job_data["job_type"],
-            job_data["salary_range"],
-            job_data["application_url"],
-            job_data["contact_email"],
-            job_data["date_posted"]
-        ))
-        
-        job_id = cursor.fetchone()["id"]
-        
-        # Insert required skills
-        for skill in job_data["required_skills"]:
-            cursor.execute("""
-            INSERT INTO job_skills (job_id, skill, is_required)
-            VALUES (%s, %s, %s)
-            """, (job_id, skill, True))
-        
-        # Insert preferred skills
-        for skill in job_data["preferred_skills"]:
-            cursor.execute("""
-            INSERT INTO job_skills (job_id, skill, is_required)
-            VALUES (%s, %s, %s)
-            """, (job_id, skill, False))
-        
-        # Insert benefits
-        if job_data["benefits"]:
-            for benefit in job_data["benefits"]:
-                cursor.execute("""
-                INSERT INTO job_benefits (job_id, benefit)
-                VALUES (%s, %s)
-                """, (job_id, benefit))
-        
+        job_id = insert_job_description(cursor, job_data)
         conn.commit()
+        stats_cache.invalidate()
         return job_id
     except Exception as e:
         conn.rollback()
@@ -74,149 +139,306 @@ def save_job_description(job_data):
         cursor.close()
         conn.close()
 
+# Function to save many job descriptions in one transaction, isolating failures per row
+def save_job_descriptions(jobs):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    outcomes = []
+    
+    try:
+        for job_data in jobs:
+            cursor.execute("SAVEPOINT save_job")
+            try:
+                job_id = insert_job_description(cursor, job_data)
+                cursor.execute("RELEASE SAVEPOINT save_job")
+                outcomes.append((job_id, None))
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT save_job")
+                outcomes.append((None, str(e)))
+        
+        conn.commit()
+        stats_cache.invalidate()
+        return outcomes
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        cursor.close()
+        conn.close()
+
+# Size of the chunks an upload is read and hashed in
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+async def read_upload(file: UploadFile):
+    """Read an upload into memory in chunks, hashing as it goes; 413 once it exceeds MAX_UPLOAD_BYTES"""
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=f"File exceeds the {MAX_UPLOAD_BYTES} byte upload limit")
+        digest.update(chunk)
+        chunks.append(chunk)
+    
+    return b"".join(chunks), digest.hexdigest()
+
 @router.post("/api/job-descriptions/analyze", response_model=JobDescriptionResponse)
 async def analyze_job_description(file: UploadFile = File(...)):
+    data, content_hash = await read_upload(file)
+    
     try:
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-            # Copy the uploaded file to the temporary file
-            shutil.copyfileobj(file.file, temp_file)
-            temp_file_path = temp_file.name
-        
         # Process the document
         processor = DocumentProcessor()
-        extracted_info = processor.process_document(temp_file_path)
+        extracted_info = await processor.process_document_async(data, file.filename, content_hash)
         
         # Save to PostgreSQL
-        job_id = save_job_description(extracted_info)
-        
-        # Clean up the temporary file
-        os.unlink(temp_file_path)
+        job_id = await run_in_threadpool(save_job_description, extracted_info)
         
         # Return the extracted information with the database ID
         response_data = {**extracted_info, "id": job_id}
         return response_data
     
+    except GeminiUnavailable as e:
+        # Fail fast; /api/job-descriptions/analyze/tasks queues the document instead
+        headers = {"Retry-After": str(int(e.retry_after) + 1)} if e.retry_after else None
+        raise HTTPException(status_code=503, detail=str(e), headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/api/job-descriptions/{job_id}", response_model=JobDescriptionResponse)
-async def get_job_description(job_id: int):
+@router.post("/api/job-descriptions/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_job_descriptions_batch(files: List[UploadFile] = File(...)):
+    """Analyze many documents concurrently (at most ANALYZE_BATCH_CONCURRENCY at once) and save them together"""
+    if len(files) > ANALYZE_BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {ANALYZE_BATCH_MAX_FILES} files per batch")
+    
+    semaphore = asyncio.Semaphore(ANALYZE_BATCH_CONCURRENCY)
+    
+    async def analyze(file):
+        async with semaphore:
+            try:
+                data, content_hash = await read_upload(file)
+                return await DocumentProcessor().process_document_async(data, file.filename, content_hash), None
+            except HTTPException as e:
+                return None, e.detail
+            except Exception as e:
+                return None, str(e)
+    
+    analyses = await asyncio.gather(*(analyze(file) for file in files))
+    
+    # Write every successful extraction through a single transaction
+    extracted = [info for info, _ in analyses if info is not None]
+    saved = iter(await run_in_threadpool(save_job_descriptions, extracted) if extracted else [])
+    
+    results = []
+    for file, (extracted_info, error) in zip(files, analyses):
+        if extracted_info is None:
+            results.append({"filename": file.filename, "status": "failed", "error": error})
+            continue
+        
+        job_id, error = next(saved)
+        if job_id is None:
+            results.append({"filename": file.filename, "status": "failed", "error": error})
+        else:
+            results.append({
+                "filename": file.filename,
+                "status": "saved",
+                "id": job_id,
+                "job": {**extracted_info, "id": job_id}
+            })
+    
+    saved_count = sum(1 for result in results if result["status"] == "saved")
+    return {
+        "total": len(results),
+        "saved": saved_count,
+        "failed": len(results) - saved_count,
+        "results": results
+    }
+
+@router.post("/api/job-descriptions/analyze/tasks", status_code=status.HTTP_202_ACCEPTED)
+async def submit_analysis_task(file: UploadFile = File(...)):
+    """Queue a document for background analysis by worker.py and return its task id"""
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension not in (".pdf", ".docx"):
+        raise HTTPException(status_code=400, detail=f"Unsupported file format: {extension}")
+    
+    content, _ = await read_upload(file)
+    task_id = await run_in_threadpool(enqueue_analysis, file.filename, content)
+    
+    return {
+        "task_id": task_id,
+        "status": "queued",
+        "status_url": f"/api/job-descriptions/analyze/tasks/{task_id}"
+    }
+
+@router.post("/api/job-descriptions/import", response_model=ImportResponse)
+def import_job_descriptions_file(file: UploadFile = File(...), format: Optional[str] = None):
+    """Bulk-load an NDJSON or CSV file of JobDescriptionCreate rows, reporting rows that failed"""
+    try:
+        fmt = detect_format(file.filename or "", format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # The upload is spooled to disk by the server; read it back line by line rather than whole
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_job_descriptions(lines, fmt)
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"File is not valid UTF-8: {e}")
+    finally:
+        lines.detach()
+        # Batches commit as they go, so earlier ones may have landed even if the import failed
+        stats_cache.invalidate()
+
+@router.get("/api/job-descriptions/analyze/tasks/{task_id}", response_model=AnalysisTaskResponse)
+def get_analysis_task(task_id: UUID):
+    """Report the progress of a queued analysis and, once completed, its result"""
+    task = get_task(str(task_id))
+    
+    if not task:
+        raise HTTPException(status_code=404, detail="Analysis task not found")
+    
+    return task
+
+# Declared before /{job_id} so "search" is not parsed as a job id
+@router.get("/api/job-descriptions/search", response_model=List[JobDescriptionResponse])
+def search_job_descriptions(
+    response: Response,
+    query: Optional[str] = None,
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    skill: Optional[str] = None,
+    job_type: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = Query(None, alias="cursor")
+):
+    """
+    Search job descriptions, most relevant first when `query` is given, newest first otherwise.
+    
+    `query` is matched against the indexed title/description text (web search
+    syntax: quoted phrases, OR, -exclusions); company, location and skill are
+    substring filters backed by trigram indexes.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # Get job description
-        cursor.execute("""
-        SELECT * FROM job_descriptions WHERE id = %s
-        """, (job_id,))
-        job = cursor.fetchone()
+        # Add WHERE clauses
+        conditions = []
+        params = []
+        columns = ""
+        from_items = ""
+        order_by = "jd.id DESC"
+        position = job_position
         
-        if not job:
-            raise HTTPException(status_code=404, detail="Job description not found")
+        if query:
+            from_items = ", websearch_to_tsquery('english', %s) AS tsq"
+            params.append(query)
+            columns = ", ts_rank(jd.search_vector, tsq)::float8 AS rank"
+            conditions.append("jd.search_vector @@ tsq")
+            order_by = "rank DESC, jd.id DESC"
+            position = ranked_job_position
         
-        # Get required skills
-        cursor.execute("""
-        SELECT skill FROM job_skills WHERE job_id = %s AND is_required = TRUE
-        """, (job_id,))
-        required_skills = [row["skill"] for row in cursor.fetchall()]
+        if company:
+            conditions.append("jd.company ILIKE %s")
+            params.append(f"%{company}%")
         
-        # Get preferred skills
-        cursor.execute("""
-        SELECT skill FROM job_skills WHERE job_id = %s AND is_required = FALSE
-        """, (job_id,))
-        preferred_skills = [row["skill"] for row in cursor.fetchall()]
+        if location:
+            conditions.append("jd.location ILIKE %s")
+            params.append(f"%{location}%")
         
-        # Get benefits
-        cursor.execute("""
-        SELECT benefit FROM job_benefits WHERE job_id = %s
-        """, (job_id,))
-        benefits = [row["benefit"] for row in cursor.fetchall()]
+        if skill:
+            # Match the skill dictionary (names and aliases) first, then the jobs listing those ids
+            conditions.append("""EXISTS (
+                SELECT 1 FROM job_skills js WHERE js.job_id = jd.id AND js.skill_id IN (
+                    SELECT id FROM skills WHERE name ILIKE %s
+                    UNION SELECT skill_id FROM skill_aliases WHERE alias ILIKE %s
+                )
+            )""")
+            params.extend([f"%{skill}%", f"%{skill}%"])
         
-        # Combine data
-        job_data = dict(job)
-        job_data["required_skills"] = required_skills
-        job_data["preferred_skills"] = preferred_skills
-        job_data["benefits"] = benefits
+        if job_type:
+            conditions.append("jd.job_type ILIKE %s")
+            params.append(f"%{job_type}%")
         
-        return job_data
+        if after and query:
+            conditions.append("(ts_rank(jd.search_vector, tsq)::float8, jd.id) < (%s, %s)")
+            params.extend(cursor_position(after, rank=float, id=int))
+            skip = 0
+        elif after:
+            conditions.append("jd.id < %s")
+            params.extend(cursor_position(after, id=int))
+            skip = 0
+        
+        # Execute query with pagination
+        jobs = select_job_descriptions(
+            cursor, " AND ".join(conditions), params, order_by, limit, skip, columns, from_items
+        )
+        set_next_cursor(response, jobs, limit, position)
+        return jobs
     
     finally:
         cursor.close()
         conn.close()
 
-@router.get("/api/job-descriptions", response_model=List[JobDescriptionResponse])
-async def list_job_descriptions(skip: int = 0, limit: int = 100):
+@router.get("/api/job-descriptions/{job_id}", response_model=JobDescriptionResponse)
+def get_job_description(job_id: int):
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # Get all job descriptions with pagination
-        cursor.execute("""
-        SELECT * FROM job_descriptions ORDER BY id DESC LIMIT %s OFFSET %s
-        """, (limit, skip))
-        jobs = cursor.fetchall()
+        # Get job description with its skills and benefits
+        jobs = select_job_descriptions(cursor, "jd.id = %s", (job_id,))
         
-        # Get all skills
-        cursor.execute("""
-        SELECT job_id, skill, is_required FROM job_skills
-        WHERE job_id IN (SELECT id FROM job_descriptions ORDER BY id DESC LIMIT %s OFFSET %s)
-        """, (limit, skip))
-        skills_rows = cursor.fetchall()
-        
-        # Get all benefits
-        cursor.execute("""
-        SELECT job_id, benefit FROM job_benefits
-        WHERE job_id IN (SELECT id FROM job_descriptions ORDER BY id DESC LIMIT %s OFFSET %s)
-        """, (limit, skip))
-        benefit_rows = cursor.fetchall()
-        
-        # Organize skills and benefits by job_id
-        skills_by_job = {}
-        benefits_by_job = {}
-        
-        for row in skills_rows:
-            job_id = row["job_id"]
-            skill = row["skill"]
-            is_required = row["is_required"]
-            
-            if job_id not in skills_by_job:
-                skills_by_job[job_id] = {"required": [], "preferred": []}
-            
-            if is_required:
-                skills_by_job[job_id]["required"].append(skill)
-            else:
-                skills_by_job[job_id]["preferred"].append(skill)
-        
-        for row in benefit_rows:
-            job_id = row["job_id"]
-            benefit = row["benefit"]
-            
-            if job_id not in benefits_by_job:
-                benefits_by_job[job_id] = []
-            
-            benefits_by_job[job_id].append(benefit)
-        
-        # Combine data
-        result = []
-        for job in jobs:
-            job_data = dict(job)
-            job_id = job["id"]
-            
-            job_data["required_skills"] = skills_by_job.get(job_id, {"required": []})["required"]
-            job_data["preferred_skills"] = skills_by_job.get(job_id, {"preferred": []})["preferred"]
-            job_data["benefits"] = benefits_by_job.get(job_id, [])
-            
-            result.append(job_data)
+        if not jobs:
+            raise HTTPException(status_code=404, detail="Job description not found")
         
-        return result
+        return jobs[0]
+    
+    finally:
+        cursor.close()
+        conn.close()
+
+@router.get(
+    "/api/job-descriptions",
+    response_model=List[JobDescriptionResponse],
+    dependencies=[Depends(conditional_get("job_descriptions", "job_skills", "skills", "job_benefits"))]
+)
+def list_job_descriptions(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = Query(None, alias="cursor")
+):
+    """List job descriptions newest first; follow X-Next-Cursor with ?cursor= instead of raising skip"""
+    conditions = []
+    params = []
+    if after:
+        # Keyset pagination: seek past the previous page instead of counting through it
+        conditions.append("jd.id < %s")
+        params.extend(cursor_position(after, id=int))
+        skip = 0
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        # Get job descriptions with their skills and benefits, with pagination
+        jobs = select_job_descriptions(cursor, " AND ".join(conditions), params, limit=limit, offset=skip)
+        set_next_cursor(response, jobs, limit, job_position)
+        return jobs
     
     finally:
         cursor.close()
         conn.close()
 
 @router.put("/api/job-descriptions/{job_id}", response_model=JobDescriptionResponse)
-async def update_job_description(job_id: int, job_data: JobDescriptionCreate):
+def update_job_description(job_id: int, job_data: JobDescriptionCreate):
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -230,6 +452,7 @@ async def update_job_description(job_id: int, job_data: JobDescriptionCreate):
             raise HTTPException(status_code=404, detail="Job description not found")
         
         # Update job description
+        salary = parse_salary(job_data.salary_range)
         cursor.execute("""
         UPDATE job_descriptions SET
             title = %s,
@@ -242,7 +465,11 @@ async def update_job_description(job_id: int, job_data: JobDescriptionCreate):
             salary_range = %s,
             application_url = %s,
             contact_email = %s,
-            date_posted = %s
+            date_posted = %s,
+            salary_min = %s,
+            salary_max = %s,
+            salary_currency = %s,
+            salary_period = %s
         WHERE id = %s
         """, (
             job_data.title,
@@ -256,39 +483,27 @@ async def update_job_description(job_id: int, job_data: JobDescriptionCreate):
             job_data.application_url,
             job_data.contact_email,
             job_data.date_posted,
+            salary["salary_min"],
+            salary["salary_max"],
+            salary["salary_currency"],
+            salary["salary_period"],
             job_id
         ))
         
         # Delete existing skills
         cursor.execute("DELETE FROM job_skills WHERE job_id = %s", (job_id,))
         
-        # Insert new required skills
-        for skill in job_data.required_skills:
-            cursor.execute("""
-            INSERT INTO job_skills (job_id, skill, is_required)
-            VALUES (%s, %s, %s)
-            """, (job_id, skill, True))
-        
-        # Insert new preferred skills
-        for skill in job_data.preferred_skills:
-            cursor.execute("""
-            INSERT INTO job_skills (job_id, skill, is_required)
-            VALUES (%s, %s, %s)
-            """, (job_id, skill, False))
-        
         # Delete existing benefits
         cursor.execute("DELETE FROM job_benefits WHERE job_id = %s", (job_id,))
         
-        # Insert new benefits
-        if job_data.benefits:
-            for benefit in job_data.benefits:
-                cursor.execute("""
-                INSERT INTO job_benefits (job_id, benefit)
-                VALUES (%s, %s)
-                """, (job_id, benefit))
+        # Insert new skills and benefits
+        insert_job_children(
+            cursor, job_id, job_data.required_skills, job_data.preferred_skills, job_data.benefits
+        )
         
         # Commit transaction
         conn.commit()
+        stats_cache.invalidate()
         
         # Return updated job
         return {**job_data.dict(), "id": job_id}
@@ -303,58 +518,16 @@ async def update_job_description(job_id: int, job_data: JobDescriptionCreate):
         conn.close()
 
 @router.post("/api/job-descriptions", response_model=JobDescriptionResponse)
-async def create_job_description(job_data: JobDescriptionCreate):
+def create_job_description(job_data: JobDescriptionCreate):
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # Insert job description
-        cursor.execute("""
-        INSERT INTO job_descriptions (
-            title, company, location, description, experience_required,
-            education_required, job_type, salary_range, application_url,
-            contact_email, date_posted
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING id
-        """, (
-            job_data.title,
-            job_data.company,
-            job_data.location,
-            job_data.description,
-            job_data.experience_required,
-            job_data.education_required,
-            job_data.job_type,
-            job_data.salary_range,
-            job_data.application_url,
-            job_data.contact_email,
-            job_data.date_posted
-        ))
-        
-        job_id = cursor.fetchone()["id"]
-        
-        # Insert required skills
-        for skill in job_data.required_skills:
-            cursor.execute("""
-            INSERT INTO job_skills (job_id, skill, is_required)
-            VALUES (%s, %s, %s)
-            """, (job_id, skill, True))
-        
-        # Insert preferred skills
-        for skill in job_data.preferred_skills:
-            cursor.execute("""
-            INSERT INTO job_skills (job_id, skill, is_required)
-            VALUES (%s, %s, %s)
-            """, (job_id, skill, False))
-        
-        # Insert benefits
-        if job_data.benefits:
-            for benefit in job_data.benefits:
-                cursor.execute("""
-                INSERT INTO job_benefits (job_id, benefit)
-                VALUES (%s, %s)
-                """, (job_id, benefit))
+        # Insert job description with its skills and benefits
+        job_id = insert_job_description(cursor, job_data.dict())
         
         conn.commit()
+        stats_cache.invalidate()
         
         # Return created job
         return {**job_data.dict(), "id": job_id}
@@ -366,123 +539,3 @@ async def create_job_description(job_data: JobDescriptionCreate):
     finally:
         cursor.close()
         conn.close()
-
-@router.get("/api/job-descriptions/search", response_model=List[JobDescriptionResponse])
-async def search_job_descriptions(
-    query: Optional[str] = None,
-    company: Optional[str] = None,
-    location: Optional[str] = None,
-    skill: Optional[str] = None,
-    job_type: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100
-):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    try:
-        # Build query
-        sql_query = """
-        SELECT DISTINCT jd.* FROM job_descriptions jd
-        """
-        
-        # Add join if searching by skill
-        if skill:
-            sql_query += " LEFT JOIN job_skills js ON jd.id = js.job_id"
-        
-        # Add WHERE clauses
-        conditions = []
-        params = []
-        
-        if query:
-            conditions.append("(jd.title ILIKE %s OR jd.description ILIKE %s)")
-            params.extend([f"%{query}%", f"%{query}%"])
-        
-        if company:
-            conditions.append("jd.company ILIKE %s")
-            params.append(f"%{company}%")
-        
-        if location:
-            conditions.append("jd.location ILIKE %s")
-            params.append(f"%{location}%")
-        
-        if skill:
-            conditions.append("js.skill ILIKE %s")
-            params.append(f"%{skill}%")
-        
-        if job_type:
-            conditions.append("jd.job_type ILIKE %s")
-            params.append(f"%{job_type}%")
-        
-        if conditions:
-            sql_query += " WHERE " + " AND ".join(conditions)
-        
-        # Add pagination
-        sql_query += " ORDER BY jd.id DESC LIMIT %s OFFSET %s"
-        params.extend([limit, skip])
-        
-        # Execute query
-        cursor.execute(sql_query, params)
-        jobs = cursor.fetchall()
-        job_ids = [job["id"] for job in jobs]
-        
-        if not job_ids:
-            return []
-        
-        # Get all skills for found jobs
-        cursor.execute("""
-        SELECT job_id, skill, is_required FROM job_skills
-        WHERE job_id = ANY(%s)
-        """, (job_ids,))
-        skills_rows = cursor.fetchall()
-        
-        # Get all benefits for found jobs
-        cursor.execute("""
-        SELECT job_id, benefit FROM job_benefits
-        WHERE job_id = ANY(%s)
-        """, (job_ids,))
-        benefit_rows = cursor.fetchall()
-        
-        # Organize skills and benefits by job_id
-        skills_by_job = {}
-        benefits_by_job = {}
-        
-        for row in skills_rows:
-            job_id = row["job_id"]
-            skill = row["skill"]
-            is_required = row["is_required"]
-            
-            if job_id not in skills_by_job:
-                skills_by_job[job_id] = {"required": [], "preferred": []}
-            
-            if is_required:
-                skills_by_job[job_id]["required"].append(skill)
-            else:
-                skills_by_job[job_id]["preferred"].append(skill)
-        
-        for row in benefit_rows:
-            job_id = row["job_id"]
-            benefit = row["benefit"]
-            
-            if job_id not in benefits_by_job:
-                benefits_by_job[job_id] = []
-            
-            benefits_by_job[job_id].append(benefit)
-        
-        # Combine data
-        result = []
-        for job in jobs:
-            job_data = dict(job)
-            job_id = job["id"]
-            
-            job_data["required_skills"] = skills_by_job.get(job_id, {"required": []})["required"]
-            job_data["preferred_skills"] = skills_by_job.get(job_id, {"preferred": []})["preferred"]
-            job_data["benefits"] = benefits_by_job.get(job_id, [])
-            
-            result.append(job_data)
-        
-        return result
-    
-    finally:
-        cursor.close()
-        conn.close()
\ No newline at end of file
@@ -1,7 +1,9 @@
 # routers/job_skills.py
 from fastapi import APIRouter, HTTPException
 from models import SkillRatingRequest
+from psycopg2.extras import execute_values
 from database import get_db_connection
+from utils.skills import resolve_skill_ids
 
 router = APIRouter(
     prefix="/api/job-skills",
@@ -9,14 +11,14 @@ router = APIRouter(
 )
 
 @router.get("/ratings/{job_id}")
-async def get_skill_ratings(job_id: int):
+def get_skill_ratings(job_id: int):
     conn = None
     try:
         conn = get_db_connection()
         cur = conn.cursor()
         
         cur.execute(
-            "SELECT * FROM job_skill_ratings WHERE job_id = %s",
+            "SELECT r.*, s.name AS skill_name FROM job_skill_ratings r JOIN skills s ON s.id = r.skill_id WHERE r.job_id = %s",
             (job_id,)
         )
         
@@ -44,7 +46,7 @@ async def get_skill_ratings(job_id: int):
             conn.close()
 
 @router.post("/ratings")
-async def save_skill_ratings(request: SkillRatingRequest):
+def save_skill_ratings(request: SkillRatingRequest):
     conn = None
     try:
         conn = get_db_connection()
@@ -56,18 +58,18 @@ async def save_skill_ratings(request: SkillRatingRequest):
             (request.job_id,)
         )
         
-        # Save required skills
-        for skill, rating in request.required_skills.items():
-            cur.execute(
-                "INSERT INTO job_skill_ratings (job_id, skill_name, rating, is_required) VALUES (%s, %s, %s, %s)",
-                (request.job_id, skill, rating, True)
-            )
+        # Resolve every rated skill against the skill dictionary in one statement
+        skill_ids = resolve_skill_ids(cur, list(request.required_skills) + list(request.preferred_skills))
         
-        # Save preferred skills
-        for skill, rating in request.preferred_skills.items():
-            cur.execute(
-                "INSERT INTO job_skill_ratings (job_id, skill_name, rating, is_required) VALUES (%s, %s, %s, %s)",
-                (request.job_id, skill, rating, False)
+        # Save required skills, then preferred ones; a skill rated twice (e.g. via an alias) keeps its first rating
+        rows = [(request.job_id, skill_ids[skill], rating, True) for skill, rating in request.required_skills.items() if skill in skill_ids]
+        rows += [(request.job_id, skill_ids[skill], rating, False) for skill, rating in request.preferred_skills.items() if skill in skill_ids]
+        if rows:
+            execute_values(
+                cur,
+                "INSERT INTO job_skill_ratings (job_id, skill_id, rating, is_required) VALUES %s ON CONFLICT (job_id, skill_id) DO NOTHING",
+                rows,
+                page_size=len(rows)
             )
         
         conn.commit()
@@ -81,15 +83,17 @@ async def save_skill_ratings(request: SkillRatingRequest):
             conn.close()
 
 @router.get("")
-async def get_all_skills():
+def get_all_skills():
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
         # Get all unique skills
         cursor.execute("""
-        SELECT DISTINCT skill, is_required FROM job_skills
-        ORDER BY skill
+        SELECT s.name AS skill, used.is_required
+        FROM (SELECT DISTINCT skill_id, is_required FROM job_skills) used
+        JOIN skills s ON s.id = used.skill_id
+        ORDER BY s.name
         """)
         skills = cursor.fetchall()
         
@@ -0,0 +1,25 @@
+# routers/metrics.py
+from fastapi import APIRouter
+from utils.metrics import snapshot
+from utils import gemini_client
+from utils.response_cache import stats_cache
+
+router = APIRouter(
+    prefix="/api/metrics",
+    tags=["metrics"]
+)
+
+@router.get("")
+def get_metrics():
+    """Counters collected by this API worker process since it started"""
+    return {"counters": snapshot()}
+
+@router.get("/gemini")
+def get_gemini_status():
+    """Gemini circuit breaker state and rate limiter headroom for this process"""
+    return gemini_client.status()
+
+@router.get("/stats-cache")
+def get_stats_cache_status():
+    """Size and settings of this process's stats response cache; hit/miss counts are in /api/metrics"""
+    return stats_cache.status()
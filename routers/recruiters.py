@@ -1,8 +1,9 @@
 # routers/recruiters.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 from models import RecruiterCreate, RecruiterResponse
 from database import get_db_connection
+from utils.etag import conditional_get
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -11,8 +12,12 @@ router = APIRouter(
     tags=["recruiters"]
 )
 
-@router.get("", response_model=List[RecruiterResponse])
-async def get_recruiters():
+@router.get(
+    "",
+    response_model=List[RecruiterResponse],
+    dependencies=[Depends(conditional_get("recruiters"))]
+)
+def get_recruiters():
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -31,7 +36,7 @@ async def get_recruiters():
         conn.close()
 
 @router.get("/{recruiter_id}", response_model=RecruiterResponse)
-async def get_recruiter(recruiter_id: int):
+def get_recruiter(recruiter_id: int):
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -52,7 +57,7 @@ async def get_recruiter(recruiter_id: int):
         conn.close()
 
 @router.post("", response_model=RecruiterResponse)
-async def create_recruiter(recruiter: RecruiterCreate):
+def create_recruiter(recruiter: RecruiterCreate):
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -74,7 +79,7 @@ async def create_recruiter(recruiter: RecruiterCreate):
         conn.close()
 
 @router.put("/{recruiter_id}", response_model=RecruiterResponse)
-async def update_recruiter(recruiter_id: int, recruiter: RecruiterCreate):
+def update_recruiter(recruiter_id: int, recruiter: RecruiterCreate):
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -106,7 +111,7 @@ async def update_recruiter(recruiter_id: int, recruiter: RecruiterCreate):
         conn.close()
 
 @router.delete("/{recruiter_id}")
-async def delete_recruiter(recruiter_id: int):
+def delete_recruiter(recruiter_id: int):
     conn = get_db_connection()
     cursor = conn.cursor()
     
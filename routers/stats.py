@@ -1,11 +1,103 @@
-from fastapi import APIRouter, HTTPException
-from config import get_db_connection
+from fastapi import APIRouter, HTTPException, Query, Depends
+from database import get_db_connection
+from utils.response_cache import stats_cache
+from utils.etag import conditional_get
 from typing import Dict, List, Any
 
 router = APIRouter(tags=["stats"])
 
+def rollup_totals(cursor):
+    """Job count and distinct values per facet, from job_rollup_totals"""
+    cursor.execute("SELECT name, total FROM job_rollup_totals")
+    return {row["name"]: row["total"] for row in cursor.fetchall()}
+
+def top_facet_values(cursor, facet, limit=None, skip_blank=False):
+    """Most common values of a job facet with their job counts, from job_facet_counts"""
+    cursor.execute("""
+    SELECT value, job_count
+    FROM job_facet_counts
+    WHERE facet = %s AND job_count > 0 AND (NOT %s OR value <> '')
+    ORDER BY job_count DESC
+    LIMIT %s
+    """, (facet, skip_blank, limit))
+    return cursor.fetchall()
+
+def top_skill_counts(cursor, is_required, limit):
+    """Skills listed by the most jobs as required (or preferred), from skill_counts"""
+    cursor.execute("""
+    SELECT s.name as skill, top.job_count as count
+    FROM (
+        SELECT skill_id, job_count
+        FROM skill_counts
+        WHERE is_required = %s AND job_count > 0
+        ORDER BY job_count DESC
+        LIMIT %s
+    ) top
+    JOIN skills s ON s.id = top.skill_id
+    ORDER BY top.job_count DESC
+    """, (is_required, limit))
+    return [{"skill": row["skill"], "count": row["count"]} for row in cursor.fetchall()]
+
+# JSON array of a facet's most common values, read top-down from idx_job_facet_counts_top
+TOP_FACET_JSON = """(
+        SELECT COALESCE(json_agg(json_build_object('{value_key}', value, '{count_key}', job_count) ORDER BY job_count DESC), '[]')
+        FROM (
+            SELECT value, job_count
+            FROM job_facet_counts
+            WHERE facet = '{facet}' AND job_count > 0 {condition}
+            ORDER BY job_count DESC
+            LIMIT {limit}
+        ) top
+    )"""
+
+# JSON array of the skills most often listed as required (or preferred), read top-down from idx_skill_counts_top
+TOP_SKILLS_JSON = """(
+        SELECT COALESCE(json_agg(json_build_object('skill', s.name, 'count', top.job_count) ORDER BY top.job_count DESC), '[]')
+        FROM (
+            SELECT skill_id, job_count
+            FROM skill_counts
+            WHERE is_required = {is_required} AND job_count > 0
+            ORDER BY job_count DESC
+            LIMIT {limit}
+        ) top
+        JOIN skills s ON s.id = top.skill_id
+    )"""
+
+NOT_BLANK = "AND value <> ''"
+
+# The whole /stats response as one JSON document, built in a single round trip
+JOB_STATS_QUERY = f"""
+SELECT json_build_object(
+    'summary', (
+        SELECT json_build_object(
+            'job_count', COALESCE(MAX(total) FILTER (WHERE name = 'jobs'), 0),
+            'company_count', COALESCE(MAX(total) FILTER (WHERE name = 'company'), 0),
+            'location_count', COALESCE(MAX(total) FILTER (WHERE name = 'location'), 0)
+        )
+        FROM job_rollup_totals
+    ),
+    'top_required_skills', {TOP_SKILLS_JSON.format(is_required="TRUE", limit=10)},
+    'top_preferred_skills', {TOP_SKILLS_JSON.format(is_required="FALSE", limit=10)},
+    'job_types', {TOP_FACET_JSON.format(facet="job_type", value_key="type", count_key="count", condition=NOT_BLANK, limit="ALL")},
+    'recent_jobs', (
+        SELECT COALESCE(json_agg(recent ORDER BY recent.created_at DESC), '[]')
+        FROM (
+            SELECT id, title, company, location, created_at
+            FROM job_descriptions
+            ORDER BY created_at DESC
+            LIMIT 5
+        ) recent
+    ),
+    'experience_levels', {TOP_FACET_JSON.format(facet="experience", value_key="level", count_key="count", condition=NOT_BLANK, limit=10)},
+    'education_requirements', {TOP_FACET_JSON.format(facet="education", value_key="education", count_key="count", condition=NOT_BLANK, limit=10)},
+    'top_companies', {TOP_FACET_JSON.format(facet="company", value_key="company", count_key="job_count", condition="", limit=10)},
+    'top_locations', {TOP_FACET_JSON.format(facet="location", value_key="location", count_key="job_count", condition="", limit=10)}
+) AS stats
+"""
+
 @router.get("/stats")
-async def get_job_stats():
+@stats_cache.cached
+def get_job_stats():
     """
     Get statistics about job descriptions, skills, and other metrics
     
@@ -14,141 +106,34 @@ async def get_job_stats():
     - Top required and preferred skills
     - Job type distribution
     - Recent job listings
+    
+    Computed in one statement (JOB_STATS_QUERY) over the rollup tables kept
+    current by triggers, so neither the round trips nor the cost grow with the
+    number of jobs.
     """
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # Count of job descriptions
-        cursor.execute("SELECT COUNT(*) as job_count FROM job_descriptions")
-        job_count = cursor.fetchone()["job_count"]
-        
-        # Count of companies
-        cursor.execute("SELECT COUNT(DISTINCT company) as company_count FROM job_descriptions")
-        company_count = cursor.fetchone()["company_count"]
-        
-        # Count of locations
-        cursor.execute("SELECT COUNT(DISTINCT location) as location_count FROM job_descriptions")
-        location_count = cursor.fetchone()["location_count"]
-        
-        # Top 10 required skills
-        cursor.execute("""
-        SELECT skill, COUNT(*) as count
-        FROM job_skills
-        WHERE is_required = TRUE
-        GROUP BY skill
-        ORDER BY count DESC
-        LIMIT 10
-        """)
-        top_required_skills = [{"skill": row["skill"], "count": row["count"]} for row in cursor.fetchall()]
-        
-        # Top 10 preferred skills
-        cursor.execute("""
-        SELECT skill, COUNT(*) as count
-        FROM job_skills
-        WHERE is_required = FALSE
-        GROUP BY skill
-        ORDER BY count DESC
-        LIMIT 10
-        """)
-        top_preferred_skills = [{"skill": row["skill"], "count": row["count"]} for row in cursor.fetchall()]
-        
-        # Job types distribution
-        cursor.execute("""
-        SELECT job_type, COUNT(*) as count
-        FROM job_descriptions
-        WHERE job_type != ''
-        GROUP BY job_type
-        ORDER BY count DESC
-        """)
-        job_types = [{"type": row["job_type"], "count": row["count"]} for row in cursor.fetchall()]
-        
-        # Recent additions
-        cursor.execute("""
-        SELECT id, title, company, location, created_at
-        FROM job_descriptions
-        ORDER BY created_at DESC
-        LIMIT 5
-        """)
-        recent_jobs = [dict(row) for row in cursor.fetchall()]
-        
-        # Experience levels
-        cursor.execute("""
-        SELECT experience_required, COUNT(*) as count
-        FROM job_descriptions
-        WHERE experience_required != ''
-        GROUP BY experience_required
-        ORDER BY count DESC
-        LIMIT 10
-        """)
-        experience_levels = [{"level": row["experience_required"], "count": row["count"]} for row in cursor.fetchall()]
-        
-        # Education requirements
-        cursor.execute("""
-        SELECT education_required, COUNT(*) as count
-        FROM job_descriptions
-        WHERE education_required != ''
-        GROUP BY education_required
-        ORDER BY count DESC
-        LIMIT 10
-        """)
-        education_requirements = [{"education": row["education_required"], "count": row["count"]} for row in cursor.fetchall()]
-        
-        # Most active companies
-        cursor.execute("""
-        SELECT company, COUNT(*) as job_count
-        FROM job_descriptions
-        GROUP BY company
-        ORDER BY job_count DESC
-        LIMIT 10
-        """)
-        top_companies = [{"company": row["company"], "job_count": row["job_count"]} for row in cursor.fetchall()]
-        
-        # Popular locations
-        cursor.execute("""
-        SELECT location, COUNT(*) as job_count
-        FROM job_descriptions
-        GROUP BY location
-        ORDER BY job_count DESC
-        LIMIT 10
-        """)
-        top_locations = [{"location": row["location"], "job_count": row["job_count"]} for row in cursor.fetchall()]
-        
-        return {
-            "summary": {
-                "job_count": job_count,
-                "company_count": company_count,
-                "location_count": location_count
-            },
-            "top_required_skills": top_required_skills,
-            "top_preferred_skills": top_preferred_skills,
-            "job_types": job_types,
-            "recent_jobs": recent_jobs,
-            "experience_levels": experience_levels,
-            "education_requirements": education_requirements,
-            "top_companies": top_companies,
-            "top_locations": top_locations
-        }
+        cursor.execute(JOB_STATS_QUERY)
+        return cursor.fetchone()["stats"]
     
     finally:
         cursor.close()
         conn.close()
 
 @router.get("/job-types")
-async def get_job_types():
+@stats_cache.cached
+def get_job_types():
     """Get list of all job types in the database with their counts"""
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        cursor.execute("""
-        SELECT DISTINCT job_type, COUNT(*) as job_count
-        FROM job_descriptions
-        WHERE job_type != ''
-        GROUP BY job_type
-        ORDER BY job_count DESC
-        """)
-        job_types = [{"type": row["job_type"], "job_count": row["job_count"]} for row in cursor.fetchall()]
+        job_types = [
+            {"type": row["value"], "job_count": row["job_count"]}
+            for row in top_facet_values(cursor, "job_type", skip_blank=True)
+        ]
         return job_types
     
     finally:
@@ -156,24 +141,40 @@ async def get_job_types():
         conn.close()
 
 @router.get("/skill-demand")
-async def get_skill_demand():
-    """Get trending skills and their growth over time"""
+@stats_cache.cached
+def get_skill_demand(
+    recent_months: int = Query(1, ge=1, le=24, description="Months, ending with the current one, averaged as recent demand"),
+    prior_months: int = Query(2, ge=1, le=60, description="Months before those averaged as previous demand")
+):
+    """
+    Get trending skills and their growth over time
+    
+    Read from skill_monthly_counts (kept current by a trigger on job_skills).
+    Growth compares a skill's average monthly listings over the last
+    recent_months months with the prior_months months before them; months
+    without listings count as zero.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # Get skill demand (using created_at from job_skills table)
+        # Skill demand per month (by job_skills.created_at), busiest months and skills first
         cursor.execute("""
-        SELECT 
-            skill,
-            COUNT(*) as total_count,
-            SUM(CASE WHEN is_required = TRUE THEN 1 ELSE 0 END) as required_count,
-            SUM(CASE WHEN is_required = FALSE THEN 1 ELSE 0 END) as preferred_count,
-            DATE_TRUNC('month', created_at) as month
-        FROM job_skills
-        GROUP BY skill, DATE_TRUNC('month', created_at)
-        ORDER BY month DESC, total_count DESC
-        LIMIT 100
+        SELECT s.name as skill, demand.total_count, demand.required_count, demand.preferred_count, demand.month
+        FROM (
+            SELECT 
+                skill_id,
+                required_count + preferred_count as total_count,
+                required_count,
+                preferred_count,
+                month
+            FROM skill_monthly_counts
+            WHERE required_count + preferred_count > 0
+            ORDER BY month DESC, required_count + preferred_count DESC
+            LIMIT 100
+        ) demand
+        JOIN skills s ON s.id = demand.skill_id
+        ORDER BY demand.month DESC, demand.total_count DESC
         """)
         
         skills_demand = []
@@ -183,44 +184,31 @@ async def get_skill_demand():
                 "total_count": row["total_count"],
                 "required_count": row["required_count"],
                 "preferred_count": row["preferred_count"],
-                "month": row["month"].strftime('%Y-%m') if row["month"] else None
+                "month": row["month"].strftime('%Y-%m')
             })
         
-        # Get top trending skills (those with increasing demand)
+        # Get top trending skills: one pass over the months in both windows, averaged per skill
         cursor.execute("""
-        WITH monthly_counts AS (
+        WITH windowed AS (
             SELECT 
-                skill,
-                DATE_TRUNC('month', created_at) as month,
-                COUNT(*) as count
-            FROM job_skills
-            GROUP BY skill, DATE_TRUNC('month', created_at)
+                skill_id,
+                required_count + preferred_count as count,
+                month >= DATE_TRUNC('month', CURRENT_DATE) - make_interval(months => %(recent)s - 1) as is_recent
+            FROM skill_monthly_counts
+            WHERE month >= DATE_TRUNC('month', CURRENT_DATE) - make_interval(months => %(recent)s + %(prior)s - 1)
+              AND month <= CURRENT_DATE
         ),
         skill_growth AS (
             SELECT 
-                skill,
-                COALESCE(
-                    (
-                        SELECT AVG(count) 
-                        FROM monthly_counts mc2 
-                        WHERE mc2.skill = mc1.skill AND 
-                              mc2.month >= (CURRENT_DATE - INTERVAL '1 month')::date
-                    ), 0
-                ) as recent_avg,
-                COALESCE(
-                    (
-                        SELECT AVG(count) 
-                        FROM monthly_counts mc2 
-                        WHERE mc2.skill = mc1.skill AND 
-                              mc2.month < (CURRENT_DATE - INTERVAL '1 month')::date AND
-                              mc2.month >= (CURRENT_DATE - INTERVAL '3 months')::date
-                    ), 0
-                ) as previous_avg
-            FROM monthly_counts mc1
-            GROUP BY skill
+                skill_id,
+                COALESCE(SUM(count) FILTER (WHERE is_recent) OVER skill, 0) / %(recent)s::numeric as recent_avg,
+                COALESCE(SUM(count) FILTER (WHERE NOT is_recent) OVER skill, 0) / %(prior)s::numeric as previous_avg,
+                ROW_NUMBER() OVER skill as skill_row
+            FROM windowed
+            WINDOW skill AS (PARTITION BY skill_id)
         )
         SELECT 
-            skill, 
+            s.name as skill, 
             recent_avg,
             previous_avg,
             CASE 
@@ -228,10 +216,11 @@ async def get_skill_demand():
                 ELSE (recent_avg - previous_avg) / previous_avg * 100
             END as growth_percent
         FROM skill_growth
-        WHERE recent_avg > 0
+        JOIN skills s ON s.id = skill_growth.skill_id
+        WHERE skill_row = 1 AND recent_avg > 0
         ORDER BY growth_percent DESC
         LIMIT 20
-        """)
+        """, {"recent": recent_months, "prior": prior_months})
         
         trending_skills = []
         for row in cursor.fetchall():
@@ -251,92 +240,126 @@ async def get_skill_demand():
         cursor.close()
         conn.close()
 
+# Jobs with a parsed salary and the middle of their range; the predicate matches idx_job_descriptions_salary
+SALARIED_JOBS = """
+    SELECT
+        job_type,
+        experience_required,
+        salary_currency,
+        salary_period,
+        salary_min,
+        salary_max,
+        COALESCE((salary_min + salary_max) / 2, salary_min, salary_max) as salary_mid
+    FROM job_descriptions
+    WHERE salary_min IS NOT NULL OR salary_max IS NOT NULL
+"""
+
+def as_float(value):
+    return float(value) if value is not None else None
+
 @router.get("/salary-analysis")
-async def get_salary_analysis():
-    """Get salary statistics across different job types and experience levels"""
+@stats_cache.cached
+def get_salary_analysis():
+    """
+    Get salary statistics across different job types and experience levels
+    
+    Aggregates the salary columns parsed from salary_range when a job is saved
+    (see utils/salary.py). Amounts are only compared within one currency and
+    pay period; percentiles are over the middle of each job's range.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # Extract minimum and maximum salary from salary_range
         cursor.execute("""
-        WITH salary_data AS (
-            SELECT 
-                id,
-                job_type,
-                experience_required,
-                REGEXP_MATCH(salary_range, '\\$?(\\d+[,\\d]*)\\s*-\\s*\\$?(\\d+[,\\d]*)') as salary_parts
-            FROM job_descriptions
-            WHERE salary_range ~* '\\$?(\\d+[,\\d]*)\\s*-\\s*\\$?(\\d+[,\\d]*)'
-        )
         SELECT 
             job_type,
             experience_required,
-            ROUND(AVG(REPLACE(salary_parts[1], ',', '')::numeric)) as avg_min_salary,
-            ROUND(AVG(REPLACE(salary_parts[2], ',', '')::numeric)) as avg_max_salary,
+            salary_currency,
+            salary_period,
+            ROUND(AVG(salary_min)) as avg_min_salary,
+            ROUND(AVG(salary_max)) as avg_max_salary,
+            PERCENTILE_CONT(ARRAY[0.25, 0.5, 0.75]) WITHIN GROUP (ORDER BY salary_mid) as quartiles,
             COUNT(*) as job_count
-        FROM salary_data
-        GROUP BY job_type, experience_required
+        FROM (""" + SALARIED_JOBS + """) salaried
+        GROUP BY job_type, experience_required, salary_currency, salary_period
         HAVING COUNT(*) > 1
-        ORDER BY avg_max_salary DESC
+        ORDER BY avg_max_salary DESC NULLS LAST
         """)
         
         salary_by_job_type = []
         for row in cursor.fetchall():
+            p25, median, p75 = row["quartiles"]
             salary_by_job_type.append({
                 "job_type": row["job_type"],
                 "experience_required": row["experience_required"],
-                "avg_min_salary": float(row["avg_min_salary"]),
-                "avg_max_salary": float(row["avg_max_salary"]),
+                "currency": row["salary_currency"],
+                "period": row["salary_period"],
+                "avg_min_salary": as_float(row["avg_min_salary"]),
+                "avg_max_salary": as_float(row["avg_max_salary"]),
+                "p25_salary": p25,
+                "median_salary": median,
+                "p75_salary": p75,
                 "job_count": row["job_count"]
             })
+        
+        # Distribution per currency and pay period
+        cursor.execute("""
+        SELECT 
+            salary_currency,
+            salary_period,
+            COUNT(*) as job_count,
+            PERCENTILE_CONT(ARRAY[0.1, 0.25, 0.5, 0.75, 0.9]) WITHIN GROUP (ORDER BY salary_mid) as percentiles
+        FROM (""" + SALARIED_JOBS + """) salaried
+        GROUP BY salary_currency, salary_period
+        ORDER BY job_count DESC
+        """)
+        
+        salary_percentiles = []
+        for row in cursor.fetchall():
+            p10, p25, median, p75, p90 = row["percentiles"]
+            salary_percentiles.append({
+                "currency": row["salary_currency"],
+                "period": row["salary_period"],
+                "job_count": row["job_count"],
+                "p10": p10,
+                "p25": p25,
+                "median": median,
+                "p75": p75,
+                "p90": p90
+            })
             
         return {
-            "salary_by_job_type": salary_by_job_type
-        }
-    except Exception as e:
-        return {
-            "error": str(e),
-            "message": "Could not analyze salary data - this may be due to inconsistent salary formats",
-            "salary_by_job_type": []
+            "salary_by_job_type": salary_by_job_type,
+            "salary_percentiles": salary_percentiles
         }
     finally:
         cursor.close()
         conn.close()
 
 @router.get("/dashboard-summary")
-async def get_dashboard_summary():
+@stats_cache.cached
+def get_dashboard_summary(
+    etag: str = Depends(conditional_get("job_descriptions", "job_skills", "skills", monthly=True))
+):
     """Get a summary of key metrics for the dashboard"""
+    # etag is unused here but keys stats_cache, so a cached summary is never served under a newer ETag
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # Job count
-        cursor.execute("SELECT COUNT(*) as count FROM job_descriptions")
-        job_count = cursor.fetchone()["count"]
+        totals = rollup_totals(cursor)
         
         # Jobs added this month
         cursor.execute("""
-        SELECT COUNT(*) as count 
-        FROM job_descriptions 
-        WHERE created_at >= DATE_TRUNC('month', CURRENT_DATE)
+        SELECT COALESCE(SUM(job_count), 0) as count
+        FROM job_facet_counts
+        WHERE facet = 'month' AND md5(value) = md5(to_char(CURRENT_DATE, 'YYYY-MM'))
         """)
         jobs_this_month = cursor.fetchone()["count"]
         
-        # Total companies
-        cursor.execute("SELECT COUNT(DISTINCT company) as count FROM job_descriptions")
-        company_count = cursor.fetchone()["count"]
-        
         # Top skills
-        cursor.execute("""
-        SELECT skill, COUNT(*) as count 
-        FROM job_skills 
-        WHERE is_required = TRUE 
-        GROUP BY skill 
-        ORDER BY count DESC 
-        LIMIT 5
-        """)
-        top_skills = [{"skill": row["skill"], "count": row["count"]} for row in cursor.fetchall()]
+        top_skills = top_skill_counts(cursor, True, 5)
         
         # Latest jobs
         cursor.execute("""
@@ -348,9 +371,9 @@ async def get_dashboard_summary():
         latest_jobs = [dict(row) for row in cursor.fetchall()]
         
         return {
-            "job_count": job_count,
+            "job_count": totals.get("jobs", 0),
             "jobs_this_month": jobs_this_month,
-            "company_count": company_count,
+            "company_count": totals.get("company", 0),
             "top_skills": top_skills,
             "latest_jobs": latest_jobs
         }
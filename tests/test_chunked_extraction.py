@@ -0,0 +1,76 @@
+# tests/test_chunked_extraction.py
+import io
+import json
+import pytest
+from PIL import Image
+
+document_processor = pytest.importorskip("utils.document_processor")
+from config import GEMINI_INPUT_TOKEN_BUDGET
+from utils.gemini_client import estimate_tokens, IMAGE_TOKENS
+
+SKILLS = ["Python", "PostgreSQL", "FastAPI", "Docker", "Kubernetes", "Communication"]
+
+
+def long_job_description(sections=40):
+    parts = ["Senior Backend Engineer\nAcme Corp, Remote\n\n"]
+    for section in range(sections):
+        parts.append(f"RESPONSIBILITIES {section}\n")
+        parts.extend(
+            f"- Design, build and operate service {section}.{line} with {', '.join(SKILLS)}.\n"
+            for line in range(25)
+        )
+        parts.append("\n")
+    return "".join(parts)
+
+
+def page_image():
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Answers like a model that fills every field of the prompt's JSON template; records each call"""
+    calls = []
+
+    def generate_content(model, parts):
+        prompt, text = parts[0], parts[1]
+        template = json.loads(prompt[prompt.index("{"):prompt.rindex("}") + 1])
+        answer = {
+            field: SKILLS if isinstance(empty, list) else (text if field == "description" else "Acme Corp")
+            for field, empty in template.items()
+        }
+        response = json.dumps(answer, indent=2)
+        calls.append({"parts": parts, "response": response})
+        return Response(response)
+
+    monkeypatch.setattr(document_processor.gemini_client, "generate_content", generate_content)
+    return calls
+
+
+def test_chunk_responses_fit_the_output_cap(calls):
+    text = long_job_description()
+    images = [page_image() for _ in range(3)]
+    processor = document_processor.DocumentProcessor()
+
+    extracted, complete = processor._generate_chunked(text, images)
+    assert complete and len(calls) > 1
+
+    max_output_tokens = document_processor.GENERATION_CONFIG["max_output_tokens"]
+    for call in calls:
+        assert estimate_tokens(call["response"]) <= max_output_tokens
+        # The first chunk leaves room for the page images sent with it
+        input_tokens = sum(
+            estimate_tokens(part) if isinstance(part, str) else IMAGE_TOKENS for part in call["parts"]
+        )
+        assert input_tokens <= GEMINI_INPUT_TOKEN_BUDGET
+    assert len(calls[0]["parts"]) == 2 + len(images)
+
+    assert extracted["description"] == text.strip()
+    assert extracted["required_skills"] == SKILLS
@@ -0,0 +1,21 @@
+# tests/test_gemini_client.py
+import pytest
+
+gemini_client = pytest.importorskip("utils.gemini_client")
+
+
+class UnusedModel:
+    def generate_content(self, parts):
+        raise AssertionError("the call should have been rejected by the rate limiter")
+
+
+def test_token_wait_timeout_refunds_the_request_slot(monkeypatch):
+    monkeypatch.setattr(gemini_client, "request_bucket", gemini_client.TokenBucket(10))
+    monkeypatch.setattr(gemini_client, "token_bucket", gemini_client.TokenBucket(100))
+    monkeypatch.setattr(gemini_client, "breaker", gemini_client.CircuitBreaker(5, 60))
+    monkeypatch.setattr(gemini_client, "GEMINI_RATE_LIMIT_WAIT", 0)
+    gemini_client.token_bucket.acquire(100, 0)
+
+    with pytest.raises(gemini_client.GeminiUnavailable):
+        gemini_client.generate_content(UnusedModel(), ["x" * 400])
+    assert gemini_client.request_bucket.available() == 10
@@ -0,0 +1,48 @@
+# tests/test_salary.py
+import pytest
+from utils.salary import parse_salary
+
+
+@pytest.mark.parametrize("salary_range, salary_min, salary_max, currency, period", [
+    ("$120,000 - $150,000", 120000, 150000, "USD", "year"),
+    ("80k–100k", 80000, 100000, None, "year"),
+    ("80-100k", 80000, 100000, None, "year"),
+    ("Salary 120000-150000", 120000, 150000, None, "year"),
+    ("₹12 LPA", 1200000, 1200000, "INR", "year"),
+    ("12-15 LPA", 1200000, 1500000, "INR", "year"),
+    ("1.2 cr", 12000000, 12000000, "INR", "year"),
+    ("Rs. 5,00,000 per annum", 500000, 500000, "INR", "year"),
+    ("$45/hr", 45, 45, "USD", "hour"),
+    ("$25 - $30 per hour", 25, 30, "USD", "hour"),
+    ("£3,000 per month", 3000, 3000, "GBP", "month"),
+    ("€50.000 - €60.000", 50000, 60000, "EUR", "year"),
+    ("120000 USD", 120000, 120000, "USD", "year"),
+    ("up to $100k", None, 100000, "USD", "year"),
+    ("$90k+", 90000, None, "USD", "year"),
+    ("$80k - $100k + 401k", 80000, 100000, "USD", "year"),
+])
+def test_parses_salary_formats(salary_range, salary_min, salary_max, currency, period):
+    assert parse_salary(salary_range) == {
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "salary_currency": currency,
+        "salary_period": period
+    }
+
+
+@pytest.mark.parametrize("salary_range", [
+    None,
+    "",
+    "Competitive",
+    "Competitive + 401k",
+    "Competitive salary, 401(k) match",
+    "Negotiable, 2 weeks PTO",
+    "Team of 12 engineers",
+    # Too large for the NUMERIC(14, 2) salary columns
+    "$9,999,999,999,999",
+    "1000000 crore",
+])
+def test_rejects_text_without_a_salary(salary_range):
+    assert parse_salary(salary_range) == dict.fromkeys(
+        ["salary_min", "salary_max", "salary_currency", "salary_period"]
+    )
@@ -0,0 +1,182 @@
+# tests/test_task_queue.py
+"""
+Claim handling of the analysis task queue against a real database (the DB_*
+settings from .env, migrated to the latest version). Skipped when no database
+is reachable.
+"""
+import functools
+import time
+import uuid
+import pytest
+
+worker = pytest.importorskip("worker")
+from database import get_db_connection
+from migrations import run_migrations
+from utils import task_queue
+
+JOB = {
+    "title": "Reclaimed Task Job", "company": "Task Queue Test", "location": "Remote",
+    "description": "Saved by the analysis worker", "experience_required": "", "education_required": "",
+    "job_type": "", "salary_range": None, "application_url": None, "contact_email": None,
+    "date_posted": None, "required_skills": [], "preferred_skills": [], "benefits": []
+}
+
+
+def execute(sql, params=()):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall() if cursor.description else None
+        conn.commit()
+        return rows
+    finally:
+        cursor.close()
+        conn.close()
+
+
+@pytest.fixture
+def task_id():
+    """A queued task ahead of every other in the queue; removed with its jobs afterwards"""
+    try:
+        run_migrations()
+    except Exception as e:
+        pytest.skip(f"Database unavailable: {e}")
+    task_id = str(uuid.uuid4())
+    execute("""
+    INSERT INTO analysis_tasks (id, filename, content, status, progress, created_at)
+    VALUES (%s, 'job.txt', 'job', 'queued', 0, TIMESTAMP 'epoch')
+    """, (task_id,))
+    yield task_id
+    execute("DELETE FROM analysis_tasks WHERE id = %s", (task_id,))
+    execute("DELETE FROM job_descriptions WHERE company = %s", (JOB["company"],))
+
+
+def reclaim(task_id):
+    """Let the task's lock expire and claim it again, as a second worker would"""
+    execute("UPDATE analysis_tasks SET locked_at = TIMESTAMP 'epoch' WHERE id = %s", (task_id,))
+    task = task_queue.claim_task()
+    assert task["task_id"] == task_id
+    return task
+
+
+def task_row(task_id):
+    return execute("SELECT status, attempts, job_id FROM analysis_tasks WHERE id = %s", (task_id,))[0]
+
+
+def saved_jobs():
+    return execute("SELECT id FROM job_descriptions WHERE company = %s", (JOB["company"],))
+
+
+class CachedProcessor:
+    """Returns a cached extraction, optionally after another worker has reclaimed the task"""
+
+    def __init__(self, reclaim_task_id=None):
+        self.reclaim_task_id = reclaim_task_id
+        self.reclaimed = None
+
+    def get_cached(self, content_hash):
+        if self.reclaim_task_id and self.reclaimed is None:
+            self.reclaimed = reclaim(self.reclaim_task_id)
+        return dict(JOB)
+
+
+def test_reclaimed_task_stops_at_next_heartbeat(task_id):
+    first = task_queue.claim_task()
+    assert first["task_id"] == task_id
+    processor = CachedProcessor(task_id)
+
+    worker.process_task(processor, first)
+    assert saved_jobs() == []
+    assert task_row(task_id)["status"] == "processing"
+
+    # The reclaiming worker's run completes the task
+    worker.process_task(processor, processor.reclaimed)
+    jobs = saved_jobs()
+    assert len(jobs) == 1
+    assert task_row(task_id) == {"status": "completed", "attempts": 2, "job_id": jobs[0]["id"]}
+
+
+def test_job_insert_rolled_back_when_reclaimed_while_saving(task_id, monkeypatch):
+    first = task_queue.claim_task()
+    reclaimed = []
+    insert_job_description = worker.insert_job_description
+
+    def insert_then_lose_claim(cursor, job_data):
+        job_id = insert_job_description(cursor, job_data)
+        if not reclaimed:
+            reclaimed.append(reclaim(task_id))
+        return job_id
+
+    monkeypatch.setattr(worker, "insert_job_description", insert_then_lose_claim)
+    worker.process_task(CachedProcessor(), first)
+    assert saved_jobs() == []
+    assert task_row(task_id)["status"] == "processing"
+
+    worker.process_task(CachedProcessor(), reclaimed[0])
+    jobs = saved_jobs()
+    assert len(jobs) == 1
+    assert task_row(task_id) == {"status": "completed", "attempts": 2, "job_id": jobs[0]["id"]}
+
+
+class SlowProcessor:
+    """Parses and extracts uncached, with an extraction slow enough for the lock to look expired"""
+
+    def __init__(self, task_id):
+        self.task_id = task_id
+        self.reclaimed = "not tried"
+
+    def get_cached(self, content_hash):
+        return None
+
+    def read_document(self, content, filename):
+        return "job", []
+
+    def extract_with_gemini(self, text, images, content_hash):
+        execute("UPDATE analysis_tasks SET locked_at = TIMESTAMP 'epoch' WHERE id = %s", (self.task_id,))
+        time.sleep(0.5)
+        # The heartbeat has refreshed the lock by now, so another worker cannot claim the task
+        self.reclaimed = task_queue.claim_task()
+        return dict(JOB)
+
+
+def test_heartbeat_keeps_a_long_extraction_claimed(task_id, monkeypatch):
+    monkeypatch.setattr(worker, "heartbeat", functools.partial(task_queue.heartbeat, interval=0.1))
+    first = task_queue.claim_task()
+    processor = SlowProcessor(task_id)
+
+    worker.process_task(processor, first)
+    assert processor.reclaimed is None
+    jobs = saved_jobs()
+    assert len(jobs) == 1
+    assert task_row(task_id) == {"status": "completed", "attempts": 1, "job_id": jobs[0]["id"]}
+
+
+def test_stale_claim_cannot_complete_or_requeue(task_id):
+    first = task_queue.claim_task()
+    second = reclaim(task_id)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        assert not task_queue.complete_task(cursor, first, None, {})
+    finally:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        assert task_queue.complete_task(cursor, second, None, {})
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+    # A late failure or release from the first worker leaves the completed task alone
+    assert not task_queue.fail_task(first, "timed out")
+    assert not task_queue.release_task(first, "Gemini unavailable")
+    with pytest.raises(task_queue.ClaimLost):
+        task_queue.update_progress(first, "saving")
+    assert task_row(task_id)["status"] == "completed"
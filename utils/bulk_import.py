@@ -0,0 +1,267 @@
+# utils/bulk_import.py
+import csv
+import io
+import json
+from pydantic import ValidationError
+from database import get_db_connection
+from models import JobDescriptionCreate
+from config import IMPORT_BATCH_SIZE, IMPORT_MAX_REPORTED_ERRORS
+from utils import metrics
+from utils.skills import INSERT_JOB_SKILLS, display_skill, normalize_skill
+from utils.salary import SALARY_COLUMNS, parse_salary
+
+JOB_COLUMNS = [
+    "title", "company", "location", "description", "experience_required",
+    "education_required", "job_type", "salary_range", "application_url",
+    "contact_email", "date_posted"
+]
+LIST_COLUMNS = ["required_skills", "preferred_skills", "benefits"]
+
+# Separator for list columns in CSV files (a JSON array in the cell also works)
+CSV_LIST_SEPARATOR = ";"
+
+
+def detect_format(filename, requested=None):
+    """Pick 'ndjson' or 'csv' from an explicit format or the file extension"""
+    fmt = (requested or "").lower() or filename.rsplit(".", 1)[-1].lower()
+    if fmt in ("ndjson", "jsonl", "json"):
+        return "ndjson"
+    if fmt == "csv":
+        return "csv"
+    raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def _split_list(value):
+    if isinstance(value, list):
+        return value
+    value = (value or "").strip()
+    if value.startswith("["):
+        return json.loads(value)
+    return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+
+
+def read_rows(lines, fmt):
+    """Yield (row_number, dict or None, error or None) for each record of an NDJSON or CSV stream"""
+    if fmt == "ndjson":
+        for row_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+                yield row_number, record, None
+            except ValueError as e:
+                yield row_number, None, f"Invalid JSON: {e}"
+        return
+
+    reader = csv.DictReader(lines)
+    for row_number, record in enumerate(reader, start=1):
+        try:
+            record = {key: value for key, value in record.items() if key}
+            for column in LIST_COLUMNS:
+                if column in record:
+                    record[column] = _split_list(record[column])
+            yield row_number, record, None
+        except ValueError as e:
+            yield row_number, None, f"Invalid list column: {e}"
+
+
+def validate_batch(rows):
+    """Split raw rows into (row_number, job dict) pairs that pass JobDescriptionCreate and (row_number, error) pairs"""
+    valid = []
+    errors = []
+    for row_number, record, error in rows:
+        if error:
+            errors.append((row_number, error))
+            continue
+        try:
+            valid.append((row_number, JobDescriptionCreate(**record).dict()))
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            errors.append((row_number, message))
+    return valid, errors
+
+
+# COPY text format escapes; None is written as \N (NULL)
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    return str(value).translate(COPY_ESCAPES)
+
+
+def _copy(cursor, table, columns, rows):
+    """COPY rows into a table from an in-memory buffer in COPY's text format"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def _create_staging_tables(cursor):
+    # Untyped TEXT staging so COPY itself never rejects a row; constraints are checked on the move
+    # The salary columns are parsed here rather than read from the file, so they can be typed
+    cursor.execute("""
+    CREATE TEMP TABLE IF NOT EXISTS import_jobs (
+        row_number INTEGER, job_id INTEGER, """ + ", ".join(f"{column} TEXT" for column in JOB_COLUMNS) + """,
+        salary_min NUMERIC, salary_max NUMERIC, salary_currency TEXT, salary_period TEXT
+    ) ON COMMIT DELETE ROWS
+    """)
+    cursor.execute("""
+    CREATE TEMP TABLE IF NOT EXISTS import_skills (
+        position INTEGER, row_number INTEGER, skill TEXT, skill_key TEXT, is_required BOOLEAN
+    ) ON COMMIT DELETE ROWS
+    """)
+    cursor.execute("""
+    CREATE TEMP TABLE IF NOT EXISTS import_benefits (
+        row_number INTEGER, benefit TEXT
+    ) ON COMMIT DELETE ROWS
+    """)
+
+
+def copy_batch(cursor, jobs):
+    """
+    Load validated (row_number, job) pairs through the staging tables and return {row_number: job_id}.
+
+    Ids are drawn from the job_descriptions sequence up front so the child rows
+    can be joined to their job without a round trip per row.
+    """
+    job_rows = []
+    for row_number, job in jobs:
+        salary = parse_salary(job["salary_range"])
+        job_rows.append(
+            [row_number] + [job[column] for column in JOB_COLUMNS] + [salary[column] for column in SALARY_COLUMNS]
+        )
+    _copy(cursor, "import_jobs", ["row_number"] + JOB_COLUMNS + SALARY_COLUMNS, job_rows)
+    skills = [
+        (row_number, skill, is_required)
+        for row_number, job in jobs
+        for field, is_required in (("required_skills", "t"), ("preferred_skills", "f"))
+        for skill in job[field] or []
+        if skill.strip()
+    ]
+    _copy(cursor, "import_skills", ["position", "row_number", "skill", "skill_key", "is_required"], [
+        [position, row_number, display_skill(skill), normalize_skill(skill), is_required]
+        for position, (row_number, skill, is_required) in enumerate(skills)
+    ])
+    _copy(cursor, "import_benefits", ["row_number", "benefit"], [
+        [row_number, benefit] for row_number, job in jobs for benefit in job["benefits"] or []
+    ])
+
+    cursor.execute("""
+    UPDATE import_jobs SET job_id = nextval(pg_get_serial_sequence('job_descriptions', 'id'))
+    RETURNING row_number, job_id
+    """)
+    job_ids = {row["row_number"]: row["job_id"] for row in cursor.fetchall()}
+
+    cursor.execute(f"""
+    INSERT INTO job_descriptions (id, {', '.join(JOB_COLUMNS + SALARY_COLUMNS)})
+    SELECT job_id, {', '.join(JOB_COLUMNS + SALARY_COLUMNS)} FROM import_jobs ORDER BY row_number
+    """)
+    cursor.execute("""
+    WITH input AS (
+        SELECT s.position, s.skill AS name, s.skill_key AS key, s.is_required, j.job_id
+        FROM import_skills s JOIN import_jobs j ON j.row_number = s.row_number
+    ),
+    """ + INSERT_JOB_SKILLS)
+    cursor.execute("""
+    INSERT INTO job_benefits (job_id, benefit)
+    SELECT j.job_id, b.benefit
+    FROM import_benefits b JOIN import_jobs j ON j.row_number = b.row_number
+    """)
+    return job_ids
+
+
+def _insert_rows(cursor, jobs):
+    """Row-by-row fallback for a batch the database rejected, isolating the offending rows"""
+    from routers.job_descriptions import insert_job_description
+
+    job_ids = {}
+    errors = []
+    for row_number, job in jobs:
+        cursor.execute("SAVEPOINT import_row")
+        try:
+            job_ids[row_number] = insert_job_description(cursor, job)
+            cursor.execute("RELEASE SAVEPOINT import_row")
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT import_row")
+            errors.append((row_number, str(e).strip()))
+    return job_ids, errors
+
+
+def _load_batch(conn, cursor, jobs):
+    """Commit one batch via COPY, falling back to per-row inserts if the database rejects it"""
+    if not jobs:
+        return {}, []
+    try:
+        job_ids = copy_batch(cursor, jobs)
+        conn.commit()
+        return job_ids, []
+    except Exception as e:
+        conn.rollback()
+        print(f"Import batch rejected, retrying row by row: {e}")
+        metrics.increment("import_batch_fallbacks")
+
+    job_ids, errors = _insert_rows(cursor, jobs)
+    conn.commit()
+    return job_ids, errors
+
+
+def import_job_descriptions(lines, fmt, batch_size=IMPORT_BATCH_SIZE, on_batch=None):
+    """
+    Stream job descriptions from NDJSON or CSV lines into the database.
+
+    Rows are validated against JobDescriptionCreate and loaded in batches of
+    `batch_size`, each committed on its own. Invalid rows are reported and
+    skipped without aborting the load. `on_batch(summary)` is called after
+    every batch for progress reporting.
+    """
+    summary = {"total": 0, "imported": 0, "failed": 0, "errors": []}
+
+    def report(errors):
+        summary["failed"] += len(errors)
+        room = IMPORT_MAX_REPORTED_ERRORS - len(summary["errors"])
+        summary["errors"].extend({"row": row, "error": error} for row, error in errors[:max(room, 0)])
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        _create_staging_tables(cursor)
+        conn.commit()
+
+        batch = []
+        rows = read_rows(lines, fmt)
+        while True:
+            batch.clear()
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    break
+            if not batch:
+                break
+
+            summary["total"] += len(batch)
+            valid, errors = validate_batch(batch)
+            job_ids, load_errors = _load_batch(conn, cursor, valid)
+
+            summary["imported"] += len(job_ids)
+            report(sorted(errors + load_errors))
+            metrics.increment("jobs_imported", len(job_ids))
+            if on_batch:
+                on_batch(summary)
+
+        return summary
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        cursor.close()
+        conn.close()
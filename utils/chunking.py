@@ -0,0 +1,108 @@
+# utils/chunking.py
+import re
+from utils.gemini_client import estimate_tokens
+
+# Lines that open a new section of a job description: ALL CAPS headings or common section names
+CAPS_HEADING = re.compile(r"^\s*[A-Z][A-Z0-9 &/,'()-]{2,60}:?\s*$")
+NAMED_HEADING = re.compile(
+    r"^\s*(?:about|responsibilities|duties|requirements|qualifications|skills|experience|education"
+    r"|benefits|perks|compensation|salary|what you|who you|you will|we offer|nice to have"
+    r"|preferred|the role|position|job description|summary|overview|how to apply)"
+    r"[^.\n]{0,40}:?\s*$",
+    re.IGNORECASE
+)
+
+# Scalar fields of JobDescriptionCreate; the first chunk that finds a value wins
+SCALAR_FIELDS = [
+    "title", "company", "location", "experience_required", "education_required",
+    "job_type", "salary_range", "application_url", "contact_email", "date_posted"
+]
+
+
+def split_sections(text):
+    """Split text into sections, each starting at a heading line"""
+    sections = []
+    current = []
+    for line in text.splitlines(keepends=True):
+        if current and (CAPS_HEADING.match(line) or NAMED_HEADING.match(line)):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def _pieces(section, budget):
+    """Yield pieces of a section within the budget, breaking at paragraphs, then lines, then characters"""
+    if estimate_tokens(section) <= budget:
+        yield section
+        return
+    for separator in ("\n\n", "\n"):
+        parts = [part for part in section.split(separator) if part]
+        if len(parts) > 1:
+            for part in parts:
+                yield from _pieces(part + separator, budget)
+            return
+    step = (budget - 1) * 4
+    for start in range(0, len(section), step):
+        yield section[start:start + step]
+
+
+def chunk_text(text, budget, first_budget=None):
+    """
+    Greedily pack section-aligned pieces of text into chunks of at most `budget` estimated tokens.
+    The first chunk is held to `first_budget` when given (room left for content sent alongside it).
+    """
+    first_budget = budget if first_budget is None else min(first_budget, budget)
+    chunks = []
+    current = []
+    current_tokens = 0
+    for section in split_sections(text):
+        for piece in _pieces(section, budget if chunks else first_budget):
+            tokens = estimate_tokens(piece)
+            if current and current_tokens + tokens > (budget if chunks else first_budget):
+                chunks.append("".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+    if current:
+        chunks.append("".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def _dedupe(values, exclude=()):
+    seen = {value.strip().lower() for value in exclude}
+    result = []
+    for value in values:
+        if not isinstance(value, str) or not value.strip():
+            continue
+        key = value.strip().lower()
+        if key not in seen:
+            seen.add(key)
+            result.append(value.strip())
+    return result
+
+
+def merge_extractions(extractions, text):
+    """
+    Combine per-chunk extractions into one JobDescriptionCreate-shaped dict.
+    Chunks are not asked for the description, so it is the document text itself.
+    """
+    merged = {}
+    for field in SCALAR_FIELDS:
+        merged[field] = next(
+            (info[field] for info in extractions if isinstance(info.get(field), str) and info[field].strip()),
+            ""
+        )
+
+    merged["description"] = text.strip()
+
+    required = _dedupe(skill for info in extractions for skill in info.get("required_skills") or [])
+    merged["required_skills"] = required
+    merged["preferred_skills"] = _dedupe(
+        (skill for info in extractions for skill in info.get("preferred_skills") or []),
+        exclude=required
+    )
+    merged["benefits"] = _dedupe(benefit for info in extractions for benefit in info.get("benefits") or [])
+    return merged
@@ -1,9 +1,14 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
 import re
 import uuid
+import hashlib
 from dotenv import load_dotenv
 import google.generativeai as genai
 import fitz  # PyMuPDF
@@ -17,6 +22,17 @@ import json
 from datetime import datetime
 from fastapi import FastAPI, HTTPException
 from database import get_db_connection
+from config import (
+    DOC_PROCESS_WORKERS, GEMINI_IO_WORKERS, GEMINI_INPUT_TOKEN_BUDGET, GEMINI_CHUNK_WORKERS,
+    PDF_TEXT_DENSITY_THRESHOLD, PDF_SCANNED_MAX_PAGES,
+    PDF_MAX_PAGES, PDF_PARALLEL_PAGE_THRESHOLD, PDF_MIN_PAGES_PER_TASK,
+    PDF_RENDER_DPI, PDF_RENDER_FORMAT, PDF_RENDER_JPEG_QUALITY
+)
+from utils.extraction_cache import extraction_cache
+from utils import metrics, gemini_client
+from utils.gemini_client import GeminiUnavailable, estimate_tokens, IMAGE_TOKENS
+from utils.chunking import chunk_text, merge_extractions
+from utils.single_flight import SingleFlight
 
 # Load environment variables
 load_dotenv()
@@ -44,61 +60,15 @@ GENERATION_CONFIG = {
     "max_output_tokens": 2048,
 }
 
+MODEL_NAME = "gemini-2.0-flash"
+
 model = genai.GenerativeModel(
-    model_name="gemini-2.0-flash",
+    model_name=MODEL_NAME,
     generation_config=GENERATION_CONFIG
 )
 
-class DocumentProcessor:
-    def process_document(self, file_path):
-        """Process a document file and extract job description information"""
-        # Determine file type
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        if file_extension == '.pdf':
-            return self._process_pdf(file_path)
-        elif file_extension in ['.docx', '.doc']:
-            return self._process_word(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {file_extension}")
-    
-    def _process_pdf(self, file_path):
-        """Process PDF file"""
-        # Open the PDF
-        pdf_document = fitz.open(file_path)
-        
-        # Extract text from all pages
-        full_text = ""
-        for page_num in range(len(pdf_document)):
-            page = pdf_document[page_num]
-            full_text += page.get_text()
-        
-        # Create an image of the first page for visual analysis
-        first_page = pdf_document[0]
-        pix = first_page.get_pixmap()
-        img_bytes = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_bytes))
-        
-        # Use Gemini to extract information from both text and image
-        return self._extract_with_gemini(full_text, img)
-    
-    def _process_word(self, file_path):
-        """Process Word document"""
-        if file_path.endswith('.docx'):
-            # Extract text from Word document
-            doc = docx.Document(file_path)
-            full_text = "\n".join([para.text for para in doc.paragraphs])
-            
-            # Use Gemini to extract information
-            return self._extract_with_gemini(full_text)
-        else:
-            # For .doc files - would need additional library
-            raise NotImplementedError("DOC file processing not implemented")
-    
-    def _extract_with_gemini(self, text, image=None):
-        """Extract job description information using Google Gemini 2.0"""
-        # Create prompt for Gemini
-        prompt = """
+# Prompt for Gemini
+EXTRACTION_PROMPT = """
         Extract the following details from the job description document:
         
         1. Job title
@@ -136,39 +106,388 @@ class DocumentProcessor:
         
         If a field is missing from the document, return an empty string or empty array as appropriate.
         """
+
+# Prompt for each part of a document too long for one call (see GEMINI_INPUT_TOKEN_BUDGET).
+# It leaves out the full description, which would make each answer as long as its part and
+# overflow max_output_tokens; the merged description is taken from the document text instead.
+CHUNK_EXTRACTION_PROMPT = """
+        Extract the following details from this part of a job description document:
         
+        1. Job title
+        2. Company name
+        3. Job location
+        4. Required skills (technical and soft skills that are explicitly mentioned as required)
+        5. Preferred/Good to have skills (skills that are mentioned as preferred, good to have, or a plus)
+        6. Years of experience required
+        7. Education requirements
+        8. Job type (full-time, part-time, contract, etc.)
+        9. Salary range (if mentioned)
+        10. Benefits (if mentioned)
+        11. Application URL (if mentioned)
+        12. Contact email (if mentioned)
+        13. Date posted (if mentioned)
+        
+        Do not copy the description text itself into the response.
+        
+        Format the response as a JSON object with these fields:
+        {
+            "title": "",
+            "company": "",
+            "location": "",
+            "required_skills": [],
+            "preferred_skills": [],
+            "experience_required": "",
+            "education_required": "",
+            "job_type": "",
+            "salary_range": "",
+            "benefits": [],
+            "application_url": "",
+            "contact_email": "",
+            "date_posted": ""
+        }
+        
+        If a field is missing from this part, return an empty string or empty array as appropriate.
+        """
+
+# Prefixed to the text of each part
+CHUNK_NOTE = "(This is part {part} of {total} of a longer job description. Extract only what this part states.)\n\n"
+
+# Document text allowed per call once the prompt and chunk note are accounted for
+TEXT_TOKEN_BUDGET = max(
+    GEMINI_INPUT_TOKEN_BUDGET
+    - max(estimate_tokens(EXTRACTION_PROMPT), estimate_tokens(CHUNK_EXTRACTION_PROMPT))
+    - estimate_tokens(CHUNK_NOTE),
+    500
+)
+
+# Identifies the prompt/model/chunking combination; cached extractions from older versions are never reused
+EXTRACTION_VERSION = hashlib.sha256(
+    json.dumps(
+        [MODEL_NAME, GENERATION_CONFIG, EXTRACTION_PROMPT, CHUNK_EXTRACTION_PROMPT, CHUNK_NOTE, TEXT_TOKEN_BUDGET],
+        sort_keys=True
+    ).encode()
+).hexdigest()[:16]
+
+# Executors for document analysis: parsing/rendering is CPU-bound and runs in
+# worker processes, while the Gemini call is network-bound and runs in threads
+_process_pool = None
+_io_executor = None
+_chunk_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_process_pool():
+    """Return the shared process pool used for document parsing and rendering"""
+    global _process_pool
+    if _process_pool is None:
+        with _executor_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=DOC_PROCESS_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _process_pool
+
+
+def get_io_executor():
+    """Return the shared thread pool used for blocking Gemini API calls"""
+    global _io_executor
+    if _io_executor is None:
+        with _executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(
+                    max_workers=GEMINI_IO_WORKERS,
+                    thread_name_prefix="gemini-io"
+                )
+    return _io_executor
+
+
+def get_chunk_executor():
+    """Return the thread pool for per-chunk Gemini calls (separate from the I/O pool that waits on them)"""
+    global _chunk_executor
+    if _chunk_executor is None:
+        with _executor_lock:
+            if _chunk_executor is None:
+                _chunk_executor = ThreadPoolExecutor(
+                    max_workers=GEMINI_CHUNK_WORKERS,
+                    thread_name_prefix="gemini-chunk"
+                )
+    return _chunk_executor
+
+
+def shutdown_executors():
+    """Shut down the document analysis executors (called on application shutdown)"""
+    global _process_pool, _io_executor, _chunk_executor
+    with _executor_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(cancel_futures=True)
+            _process_pool = None
+        if _io_executor is not None:
+            _io_executor.shutdown(cancel_futures=True)
+            _io_executor = None
+        if _chunk_executor is not None:
+            _chunk_executor.shutdown(cancel_futures=True)
+            _chunk_executor = None
+
+
+# Identical documents analyzed at the same time share one parse + Gemini call
+_inflight_extractions = SingleFlight("extractions")
+
+
+def hash_content(data):
+    """SHA-256 hex digest of a document's bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def parse_document(data, filename):
+    """
+    Extract ((text, encoded page images, mode), page count) from a document; runs in a worker process.
+
+    A PDF over PDF_PARALLEL_PAGE_THRESHOLD pages is only opened and counted, returning
+    (None, page count), so the caller can extract its page ranges across the pool instead.
+    """
+    if os.path.splitext(filename)[1].lower() != '.pdf':
+        return DocumentProcessor().parse_document(data, filename), 0
+    
+    with fitz.open(stream=data, filetype="pdf") as pdf_document:
+        page_count = min(len(pdf_document), PDF_MAX_PAGES)
+        if page_count > PDF_PARALLEL_PAGE_THRESHOLD:
+            return None, page_count
+        return DocumentProcessor()._read_open_pdf(pdf_document), page_count
+
+
+def extract_pdf_page_texts(data, start, stop):
+    """Text of PDF pages [start, stop); runs in a worker process for large documents"""
+    with fitz.open(stream=data, filetype="pdf") as pdf_document:
+        return DocumentProcessor()._page_texts(pdf_document, start, stop)
+
+
+def render_pdf_pages(data):
+    """Rendered images of a scanned PDF's leading pages; runs in a worker process"""
+    with fitz.open(stream=data, filetype="pdf") as pdf_document:
+        return DocumentProcessor()._render_pages(pdf_document)
+
+
+class DocumentProcessor:
+    def process_document(self, data, filename, content_hash=None):
+        """Process an in-memory document and extract job description information"""
+        content_hash = content_hash or hash_content(data)
+        cached = self.get_cached(content_hash)
+        if cached is not None:
+            return cached
+        
+        text, images = self.read_document(data, filename)
+        return self.extract_with_gemini(text, images, content_hash)
+
+    async def process_document_async(self, data, filename, content_hash=None):
+        """Like process_document, but parses in the process pool and calls Gemini in the I/O pool"""
+        loop = asyncio.get_running_loop()
+        io_executor = get_io_executor()
+        
+        if content_hash is None:
+            content_hash = await loop.run_in_executor(io_executor, hash_content, data)
+        
+        return await _inflight_extractions.do(
+            self._cache_key(content_hash),
+            lambda: self._process_uncached_async(data, filename, content_hash)
+        )
+
+    async def _process_uncached_async(self, data, filename, content_hash):
+        loop = asyncio.get_running_loop()
+        io_executor = get_io_executor()
+        
+        cached = await loop.run_in_executor(io_executor, self.get_cached, content_hash)
+        if cached is not None:
+            return cached
+        
+        # Opening and counting a PDF is CPU-bound too, so it happens in the pool task that parses it
+        parsed, page_count = await loop.run_in_executor(get_process_pool(), parse_document, data, filename)
+        if parsed is None:
+            text, images, mode = await self._parse_large_pdf_async(data, page_count)
+        else:
+            text, images, mode = parsed
+        self._record_parse(mode, images)
+        return await loop.run_in_executor(io_executor, self.extract_with_gemini, text, images, content_hash)
+
+    async def _parse_large_pdf_async(self, data, page_count):
+        """Extract page ranges of a long PDF across the process pool and join them in order"""
+        loop = asyncio.get_running_loop()
+        process_pool = get_process_pool()
+        
+        pages_per_task = max(PDF_MIN_PAGES_PER_TASK, -(-page_count // DOC_PROCESS_WORKERS))
+        ranges = [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+        page_texts = await asyncio.gather(*(
+            loop.run_in_executor(process_pool, extract_pdf_page_texts, data, start, stop)
+            for start, stop in ranges
+        ))
+        metrics.increment("pdf_parallel_parses")
+        
+        full_text = "".join(text for texts in page_texts for text in texts)
+        if self._is_text_rich(full_text, page_count):
+            return full_text, [], "text"
+        
+        images = await loop.run_in_executor(process_pool, render_pdf_pages, data)
+        return full_text, images, "scanned"
+
+    def get_cached(self, content_hash):
+        """Return a previous Gemini extraction of the same document bytes, or None"""
+        return extraction_cache.get(self._cache_key(content_hash))
+
+    def _cache_key(self, content_hash):
+        return f"{content_hash}:{EXTRACTION_VERSION}"
+
+    def read_document(self, data, filename):
+        """Extract the raw text and any page images to send with it from document bytes"""
+        text, images, mode = self.parse_document(data, filename)
+        self._record_parse(mode, images)
+        return text, images
+
+    def _record_parse(self, mode, images):
+        # Recorded by the calling process, since counters in pool workers are never reported
+        metrics.increment(f"documents_parsed_{mode}")
+        metrics.increment("page_images_rendered", len(images))
+        metrics.increment("page_image_bytes", sum(len(image) for image in images))
+
+    def parse_document(self, data, filename):
+        """Extract (text, images, mode) without recording metrics; mode is 'text', 'scanned' or 'word'"""
+        # Determine file type
+        file_extension = os.path.splitext(filename)[1].lower()
+        
+        if file_extension == '.pdf':
+            return self._read_pdf(data)
+        elif file_extension == '.docx':
+            return self._read_word(data)
+        elif file_extension == '.doc':
+            # For .doc files - would need additional library
+            raise NotImplementedError("DOC file processing not implemented")
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+    
+    def _read_pdf(self, data):
+        """Read PDF text, rendering page images only when the text layer is too thin to rely on"""
+        # Open the PDF straight from memory
+        with fitz.open(stream=data, filetype="pdf") as pdf_document:
+            return self._read_open_pdf(pdf_document)
+    
+    def _read_open_pdf(self, pdf_document):
+        # Extract text from all pages (up to PDF_MAX_PAGES)
+        page_count = min(len(pdf_document), PDF_MAX_PAGES)
+        full_text = "".join(self._page_texts(pdf_document, 0, page_count))
+        
+        if self._is_text_rich(full_text, page_count):
+            return full_text, [], "text"
+        
+        return full_text, self._render_pages(pdf_document), "scanned"
+    
+    def _page_texts(self, pdf_document, start, stop):
+        return [pdf_document[page_num].get_text() for page_num in range(start, stop)]
+    
+    def _is_text_rich(self, text, page_count):
+        # Text-rich PDFs gain nothing from an image; scans and image-only PDFs need one
+        return len(text.strip()) / max(page_count, 1) >= PDF_TEXT_DENSITY_THRESHOLD
+    
+    def _render_pages(self, pdf_document):
+        page_limit = min(len(pdf_document), PDF_SCANNED_MAX_PAGES)
+        return [self._render_page(pdf_document[page_num]) for page_num in range(page_limit)]
+    
+    def _render_page(self, page):
+        """Render a page to encoded image bytes (bytes, unlike PIL images, cross the process boundary)"""
+        pix = page.get_pixmap(dpi=PDF_RENDER_DPI)
+        if PDF_RENDER_FORMAT == "png":
+            return pix.tobytes("png")
+        return pix.tobytes("jpg", jpg_quality=PDF_RENDER_JPEG_QUALITY)
+    
+    def _read_word(self, data):
+        """Read Word (.docx) document text"""
+        doc = docx.Document(io.BytesIO(data))
+        full_text = "\n".join([para.text for para in doc.paragraphs])
+        
+        return full_text, [], "word"
+    
+    def extract_with_gemini(self, text, images=(), content_hash=None):
+        """Extract job description information using Google Gemini 2.0 (images are encoded page bytes)"""
+        complete = True
         try:
-            # If we have both text and image
-            if image:
-                response = model.generate_content([prompt, text, image])
-            else:
-                response = model.generate_content([prompt, text])
-            
-            # Get the response text
-            response_text = response.text
-            
-            # Extract JSON from response (handle potential extra text)
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-            
-            if json_start >= 0 and json_end > 0:
-                json_str = response_text[json_start:json_end]
-                try:
-                    extracted_info = json.loads(json_str)
-                    return extracted_info
-                except json.JSONDecodeError:
-                    # Try to clean up the JSON
-                    cleaned_json = self._clean_json_string(json_str)
-                    extracted_info = json.loads(cleaned_json)
-                    return extracted_info
+            if estimate_tokens(text) > self._text_budget(images):
+                extracted_info, complete = self._generate_chunked(text, images)
             else:
-                # Fallback to basic extraction
-                return self._extract_basic_info(text)
-                
+                extracted_info = self._generate_with_gemini(text, images)
+        except GeminiUnavailable:
+            # Quota/outage: surface it rather than saving regex guesses as a real analysis
+            raise
         except Exception as e:
             print(f"Error with Gemini extraction: {e}")
-            # Fallback to basic extraction
+            # Fallback to basic extraction (never cached, so a later upload retries Gemini)
             return self._extract_basic_info(text)
+        
+        # A partial extraction is returned but not cached, so a later upload retries the missing chunks
+        if content_hash and complete:
+            extraction_cache.set(self._cache_key(content_hash), extracted_info)
+        return extracted_info
+    
+    def _text_budget(self, images):
+        """Document text allowed in a call that also carries these page images"""
+        return max(TEXT_TOKEN_BUDGET - IMAGE_TOKENS * len(images), 500)
+    
+    def _generate_chunked(self, text, images=()):
+        """
+        Extract section-aligned chunks of an over-budget document in parallel and merge the results.
+        Returns (merged extraction, whether every chunk was extracted).
+        """
+        # Page images ride along with the first chunk only, so only it gives up room for them
+        chunks = chunk_text(text, TEXT_TOKEN_BUDGET, first_budget=self._text_budget(images))
+        metrics.increment("documents_chunked")
+        metrics.increment("document_chunks", len(chunks))
+        
+        executor = get_chunk_executor()
+        futures = [
+            executor.submit(
+                self._generate_with_gemini,
+                CHUNK_NOTE.format(part=index + 1, total=len(chunks)) + chunk,
+                images if index == 0 else (),
+                CHUNK_EXTRACTION_PROMPT
+            )
+            for index, chunk in enumerate(chunks)
+        ]
+        
+        extractions = []
+        for index, future in enumerate(futures):
+            try:
+                extractions.append(future.result())
+            except GeminiUnavailable:
+                raise
+            except Exception as e:
+                # Keep what the other chunks found
+                print(f"Error with Gemini extraction of chunk {index + 1}/{len(chunks)}: {e}")
+                metrics.increment("document_chunks_failed")
+        
+        if not extractions:
+            raise ValueError("No chunk of the document could be extracted")
+        return merge_extractions(extractions, text), len(extractions) == len(chunks)
+    
+    def _generate_with_gemini(self, text, images=(), prompt=EXTRACTION_PROMPT):
+        """Call Gemini and parse its JSON answer; raises if no usable JSON comes back"""
+        # Send page images along with the text only when parsing decided they are needed
+        parts = [prompt, text]
+        parts.extend(Image.open(io.BytesIO(image)) for image in images)
+        response = gemini_client.generate_content(model, parts)
+        
+        # Get the response text
+        response_text = response.text
+        
+        # Extract JSON from response (handle potential extra text)
+        json_start = response_text.find('{')
+        json_end = response_text.rfind('}') + 1
+        
+        if json_start < 0 or json_end <= 0:
+            raise ValueError("Gemini response contained no JSON object")
+        
+        json_str = response_text[json_start:json_end]
+        try:
+            return json.loads(json_str)
+        except json.JSONDecodeError:
+            # Try to clean up the JSON
+            return json.loads(self._clean_json_string(json_str))
     
     def _clean_json_string(self, json_str):
         """Clean up common JSON formatting issues"""
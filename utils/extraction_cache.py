@@ -0,0 +1,134 @@
+# utils/extraction_cache.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+from psycopg2.extras import Json
+from database import get_db_connection
+from config import EXTRACTION_CACHE_MEMORY_SIZE, EXTRACTION_CACHE_TTL, EXTRACTION_CACHE_DB_MAX_ROWS
+
+# Run the database size/TTL sweep once every this many writes
+DB_EVICTION_INTERVAL = 100
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of Gemini extraction results keyed by document hash + prompt version.
+
+    An in-process LRU answers repeat uploads without I/O; misses fall through to
+    the extraction_cache table, which is shared by every API and worker process.
+    Both tiers expire entries after `ttl` seconds and are bounded in size.
+    Database errors are logged and treated as misses so caching never breaks analysis.
+    """
+
+    def __init__(self, memory_size, ttl, db_max_rows):
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self.db_max_rows = db_max_rows
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, key):
+        """Return a copy of the cached result for key, or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    return copy.deepcopy(value)
+                del self._entries[key]
+
+        value = self._db_get(key)
+        if value is not None:
+            self._remember(key, value)
+            return copy.deepcopy(value)
+        return None
+
+    def set(self, key, value):
+        """Store a result in both tiers"""
+        self._remember(key, copy.deepcopy(value))
+        self._db_set(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.memory_size:
+                self._entries.popitem(last=False)
+
+    def _db_get(self, key):
+        conn = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+            UPDATE extraction_cache SET last_used_at = CURRENT_TIMESTAMP
+            WHERE cache_key = %s AND created_at > CURRENT_TIMESTAMP - make_interval(secs => %s)
+            RETURNING result
+            """, (key, self.ttl))
+            row = cursor.fetchone()
+            conn.commit()
+            cursor.close()
+            return row["result"] if row else None
+        except Exception as e:
+            print(f"Extraction cache read error: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def _db_set(self, key, value):
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % DB_EVICTION_INTERVAL == 0
+
+        conn = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT INTO extraction_cache (cache_key, result)
+            VALUES (%s, %s)
+            ON CONFLICT (cache_key) DO UPDATE SET
+                result = EXCLUDED.result,
+                created_at = CURRENT_TIMESTAMP,
+                last_used_at = CURRENT_TIMESTAMP
+            """, (key, Json(value)))
+
+            if sweep:
+                # Drop expired rows, then the least recently used ones beyond the size bound
+                cursor.execute("""
+                DELETE FROM extraction_cache
+                WHERE created_at <= CURRENT_TIMESTAMP - make_interval(secs => %s)
+                """, (self.ttl,))
+                cursor.execute("""
+                DELETE FROM extraction_cache WHERE cache_key IN (
+                    SELECT cache_key FROM extraction_cache
+                    ORDER BY last_used_at DESC
+                    OFFSET %s
+                )
+                """, (self.db_max_rows,))
+
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            print(f"Extraction cache write error: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+
+extraction_cache = ExtractionCache(
+    memory_size=EXTRACTION_CACHE_MEMORY_SIZE,
+    ttl=EXTRACTION_CACHE_TTL,
+    db_max_rows=EXTRACTION_CACHE_DB_MAX_ROWS
+)
@@ -0,0 +1,210 @@
+# utils/gemini_client.py
+import random
+import threading
+import time
+from google.api_core import exceptions as google_exceptions
+from config import (
+    GEMINI_REQUESTS_PER_MINUTE, GEMINI_TOKENS_PER_MINUTE, GEMINI_RATE_LIMIT_WAIT,
+    GEMINI_MAX_RETRIES, GEMINI_BACKOFF_BASE, GEMINI_BACKOFF_MAX,
+    GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_RESET_SECONDS
+)
+from utils import metrics
+
+# Errors worth retrying: quota, overload and transient server/network failures
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    ConnectionError,
+    TimeoutError,
+)
+
+# Rough input cost of one attached page image
+IMAGE_TOKENS = 258
+
+
+class GeminiUnavailable(Exception):
+    """Gemini cannot take the call right now (circuit open, quota wait exceeded or retries exhausted)"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_tokens(text):
+    """Cheap token estimate for Gemini models (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `per_minute` tokens per minute"""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self._tokens = float(per_minute)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, amount, timeout):
+        """Take `amount` tokens, waiting up to `timeout` seconds; returns False if they never came"""
+        amount = min(amount, self.capacity)
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait = (amount - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def refund(self, amount):
+        """Return tokens taken by acquire() for a call that was never made"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + min(amount, self.capacity))
+
+    def available(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return int(self._tokens)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed: calls flow. After `failure_threshold` failures in a row it opens and
+    rejects calls for `reset_timeout` seconds, then goes half-open and lets a
+    single trial call through; its success closes the circuit, a failure reopens it.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = "half_open"
+                self._trial_in_flight = False
+            if self._state == "half_open":
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """Give back a half-open trial slot without judging Gemini's health"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    metrics.increment("gemini_circuit_opened")
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+    def retry_after(self):
+        """Seconds until an open circuit lets a trial call through"""
+        with self._lock:
+            if self._state != "open":
+                return 0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def snapshot(self):
+        retry_after = self.retry_after()
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "retry_after_seconds": round(retry_after, 1)
+            }
+
+
+request_bucket = TokenBucket(GEMINI_REQUESTS_PER_MINUTE)
+token_bucket = TokenBucket(GEMINI_TOKENS_PER_MINUTE)
+breaker = CircuitBreaker(GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_RESET_SECONDS)
+
+
+def generate_content(model, parts):
+    """
+    model.generate_content behind the process-wide rate limits, retries and circuit breaker.
+
+    Retryable errors back off exponentially with full jitter. Raises
+    GeminiUnavailable instead of letting callers fall back to poor-quality
+    output while Gemini is degraded; any other error propagates unchanged.
+    """
+    if not breaker.allow():
+        metrics.increment("gemini_rejected_circuit_open")
+        raise GeminiUnavailable("Gemini circuit breaker is open", breaker.retry_after())
+
+    estimated = sum(estimate_tokens(part) if isinstance(part, str) else IMAGE_TOKENS for part in parts)
+
+    attempt = 0
+    while True:
+        acquired = request_bucket.acquire(1, GEMINI_RATE_LIMIT_WAIT)
+        if acquired and not token_bucket.acquire(estimated, GEMINI_RATE_LIMIT_WAIT):
+            # The call is not made, so give back the request slot it reserved
+            request_bucket.refund(1)
+            acquired = False
+        if not acquired:
+            metrics.increment("gemini_rejected_rate_limit")
+            breaker.release()
+            raise GeminiUnavailable("Gemini rate limit wait exceeded", GEMINI_RATE_LIMIT_WAIT)
+
+        try:
+            metrics.increment("gemini_calls")
+            response = model.generate_content(parts)
+            breaker.record_success()
+            return response
+        except RETRYABLE_ERRORS as e:
+            metrics.increment("gemini_retryable_errors")
+            breaker.record_failure()
+            attempt += 1
+            if attempt > GEMINI_MAX_RETRIES or not breaker.allow():
+                raise GeminiUnavailable(f"Gemini unavailable: {e}", breaker.retry_after() or None) from e
+            metrics.increment("gemini_retries")
+            time.sleep(random.uniform(0, min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * 2 ** attempt)))
+        except Exception:
+            # A non-retryable error (bad request, blocked prompt) is not an outage
+            breaker.release()
+            raise
+
+
+def status():
+    """Breaker state and remaining limiter capacity, for the status endpoint"""
+    return {
+        "circuit": breaker.snapshot(),
+        "requests_available": request_bucket.available(),
+        "requests_per_minute": request_bucket.capacity,
+        "tokens_available": token_bucket.available(),
+        "tokens_per_minute": token_bucket.capacity
+    }
@@ -0,0 +1,19 @@
+# utils/metrics.py
+import threading
+from collections import defaultdict
+
+# Process-local counters; each uvicorn/worker process reports its own totals
+_counters = defaultdict(int)
+_lock = threading.Lock()
+
+
+def increment(name, value=1):
+    """Add value to the named counter"""
+    with _lock:
+        _counters[name] += value
+
+
+def snapshot():
+    """Return a copy of every counter"""
+    with _lock:
+        return dict(_counters)
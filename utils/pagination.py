@@ -0,0 +1,29 @@
+# utils/pagination.py
+import base64
+import json
+
+# Response header carrying the cursor of the next page; list bodies keep their plain-array shape
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(position):
+    """Opaque cursor for a keyset position such as {"id": 42}"""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Keyset position from a cursor; ValueError if it was not produced by encode_cursor"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
+
+
+def set_next_cursor(response, rows, limit, position):
+    """Point X-Next-Cursor at the rows after this page when the page came back full"""
+    if limit and len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(position(rows[-1]))
@@ -0,0 +1,138 @@
+# utils/response_cache.py
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from utils import metrics
+from config import STATS_CACHE_TTL, STATS_CACHE_STALE_TTL, STATS_CACHE_MAX_ENTRIES
+
+# Misses are computed under one of this many locks, picked by key, so concurrent misses compute once
+COMPUTE_LOCK_STRIPES = 16
+
+
+class ResponseCache:
+    """
+    Per-process cache of endpoint responses keyed by endpoint and arguments.
+
+    A response is fresh for `ttl` seconds. For `stale_ttl` seconds after that it
+    is still returned at once while a background thread recomputes it
+    (stale-while-revalidate), so no request waits on a refresh. Concurrent
+    misses on one key compute it once. invalidate() drops every entry and
+    discards computations that started before it. At most `max_entries`
+    responses are kept, least recently used evicted first. Hits, stale hits,
+    misses, refreshes and invalidations are counted in utils.metrics under
+    `<name>_...`.
+    """
+
+    def __init__(self, name, max_entries, ttl, stale_ttl):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._compute_locks = [threading.Lock() for _ in range(COMPUTE_LOCK_STRIPES)]
+        self._refreshing = set()
+        self._generation = 0
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"{name}-refresh")
+
+    def get(self, key, compute):
+        """Return the cached response for key, calling compute() to produce it when needed"""
+        value, state = self._lookup(key)
+        if state == "fresh":
+            metrics.increment(f"{self.name}_hits")
+            return value
+        if state == "stale":
+            metrics.increment(f"{self.name}_stale_hits")
+            self._start_refresh(key, compute)
+            return value
+
+        with self._compute_locks[hash(key) % COMPUTE_LOCK_STRIPES]:
+            # Another request may have computed it while this one waited
+            value, state = self._lookup(key)
+            if state is not None:
+                metrics.increment(f"{self.name}_hits")
+                return value
+            metrics.increment(f"{self.name}_misses")
+            return self._compute(key, compute)
+
+    def cached(self, endpoint):
+        """Decorate a sync endpoint so its responses are cached per set of arguments"""
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            key = (endpoint.__name__, args, tuple(sorted(kwargs.items())))
+            return self.get(key, lambda: endpoint(*args, **kwargs))
+        return wrapper
+
+    def invalidate(self):
+        """Drop every cached response; call after committing a write the responses depend on"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+        metrics.increment(f"{self.name}_invalidations")
+
+    def status(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "refreshing": len(self._refreshing)
+            }
+
+    def _lookup(self, key):
+        """(value, "fresh" | "stale") for a usable entry, else (None, None)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            stored_at, value = entry
+            age = now - stored_at
+            if age > self.ttl + self.stale_ttl:
+                del self._entries[key]
+                return None, None
+            self._entries.move_to_end(key)
+            return value, "fresh" if age <= self.ttl else "stale"
+
+    def _compute(self, key, compute):
+        with self._lock:
+            generation = self._generation
+        value = compute()
+        with self._lock:
+            # A write committed while computing may not be reflected; leave the key for the next request
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def _start_refresh(self, key, compute):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._refresher.submit(self._refresh, key, compute)
+
+    def _refresh(self, key, compute):
+        try:
+            self._compute(key, compute)
+            metrics.increment(f"{self.name}_refreshes")
+        except Exception as e:
+            # The stale response keeps being served until it ages out
+            print(f"{self.name} refresh of {key[0]} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+# Responses of the routers/stats.py endpoints, cleared by job description writes
+stats_cache = ResponseCache(
+    name="stats_cache",
+    max_entries=STATS_CACHE_MAX_ENTRIES,
+    ttl=STATS_CACHE_TTL,
+    stale_ttl=STATS_CACHE_STALE_TTL
+)
@@ -0,0 +1,207 @@
+# utils/salary.py
+import re
+from psycopg2.extras import execute_values
+from database import get_db_connection
+
+# job_descriptions columns filled from salary_range by parse_salary()
+SALARY_COLUMNS = ["salary_min", "salary_max", "salary_currency", "salary_period"]
+
+# "US$", "C$", "A$", "S$" or a bare "$"
+DOLLAR = re.compile(r"(us|ca|c|au|a|s)?\$")
+DOLLAR_CURRENCIES = {"us": "USD", "ca": "CAD", "c": "CAD", "au": "AUD", "a": "AUD", "s": "SGD", None: "USD"}
+CURRENCY_SYMBOLS = {"€": "EUR", "£": "GBP", "₹": "INR", "¥": "JPY"}
+CURRENCY_WORDS = re.compile(
+    r"\b(usd|eur|gbp|inr|cad|aud|sgd|jpy|chf|aed|rs|rupees?|dollars?|euros?|pounds?|yen)\b"
+)
+CURRENCY_WORD_CODES = {
+    "rs": "INR", "rupee": "INR", "rupees": "INR", "dollar": "USD", "dollars": "USD",
+    "euro": "EUR", "euros": "EUR", "pound": "GBP", "pounds": "GBP", "yen": "JPY"
+}
+
+# An amount with an optional magnitude suffix: "120,000", "12,00,000", "50.000", "12.5", "80k", "12 LPA", "1.2 cr"
+AMOUNT = re.compile(
+    r"(\d{1,3}(?:,\d{2,3})+(?:\.\d+)?|\d{1,3}(?:\.\d{3})+(?![\d.])|\d+(?:\.\d+)?)"
+    r"\s*(k|mn|m|million|lakhs?|lacs?|lpa|l|crores?|cr)?(?![a-z])"
+)
+MAGNITUDES = {
+    "k": 1e3, "m": 1e6, "mn": 1e6, "million": 1e6,
+    "l": 1e5, "lac": 1e5, "lacs": 1e5, "lakh": 1e5, "lakhs": 1e5, "lpa": 1e5,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7
+}
+# Indian magnitudes imply rupees when no currency is given
+INR_MAGNITUDES = {"l", "lac", "lacs", "lakh", "lakhs", "lpa", "cr", "crore", "crores"}
+
+# A number only counts as an amount next to a currency marker, a pay period or a range separator
+# joining it to another number (or with a magnitude suffix); "Competitive + 401k" names a retirement plan
+CURRENCY_BEFORE = re.compile(r"(?:[$€£₹¥]|\b(?:usd|eur|gbp|inr|cad|aud|sgd|jpy|chf|aed|rs)\.?)\s*$")
+CURRENCY_AFTER = re.compile(r"\s*(?:[$€£₹¥]|(?:usd|eur|gbp|inr|cad|aud|sgd|jpy|chf|aed|rupees?|dollars?|euros?|pounds?|yen)\b)")
+PERIOD_AFTER = re.compile(
+    r"\s*(?:/\s*(?:h|hr|hour|d|day|wk|week|mo|month|yr|year|annum)\b|per\b|an?\s+(?:hour|day|week|month|year)\b"
+    r"|hourly|daily|weekly|monthly|yearly|annual|p\.?a\b|p\.?m\b|ctc\b)"
+)
+RANGE_GAP = re.compile(r"\s*(?:-|to)\s*(?:[a-z]{0,2}\$|[€£₹¥]|(?:usd|eur|gbp|inr|rs)\.?)?\s*")
+RETIREMENT_PLAN = re.compile(r"\b401\s*\(?k\)?")
+# salary_min/salary_max are NUMERIC(14, 2); anything this large is a misparse, not a salary
+SALARY_LIMIT = 1e12
+
+# Pay period markers, checked in order
+PERIODS = [
+    ("hour", re.compile(r"per\s+hour|an?\s+hour|hourly|/\s*h(?:ou)?r\b|/\s*h\b")),
+    ("day", re.compile(r"per\s+day|a\s+day|daily|/\s*day\b")),
+    ("week", re.compile(r"per\s+week|a\s+week|weekly|/\s*w(?:ee)?k\b")),
+    ("month", re.compile(r"per\s+month|a\s+month|monthly|/\s*mo(?:nth)?\b|\bp\.?m\.?$")),
+    ("year", re.compile(r"per\s+(?:year|annum)|a\s+year|yearly|annual|/\s*y(?:ea)?r\b|\bp\.?a\.?\b|\blpa\b|\bctc\b")),
+]
+# Without a period marker, amounts below this are taken as hourly rates and the rest as yearly salaries
+HOURLY_RATE_LIMIT = 1000
+
+UP_TO = re.compile(r"\b(?:up\s*to|upto|max(?:imum)?|below|under)\b")
+AT_LEAST = re.compile(r"\b(?:from|starting(?:\s+at)?|min(?:imum)?|at\s+least|above|over)\b|\d\s*[kml]?\s*\+")
+
+
+def _amount(number, magnitude):
+    if "," in number:
+        number = number.replace(",", "")
+    elif re.fullmatch(r"\d{1,3}(?:\.\d{3})+", number):
+        # "50.000" is fifty thousand, written with European separators
+        number = number.replace(".", "")
+    return float(number) * MAGNITUDES.get(magnitude, 1)
+
+
+def _is_range(text, low, high):
+    """Whether two AMOUNT matches are the ends of a range such as "80 - 100" or "$80k to $100k" (nothing else between)"""
+    return RANGE_GAP.fullmatch(text, low.end(), high.start()) is not None
+
+
+def _amount_matches(text):
+    """(number, magnitude) for each number in text that reads as an amount of money"""
+    found = list(AMOUNT.finditer(text))
+    amounts = []
+    for index, match in enumerate(found):
+        joined = (index > 0 and _is_range(text, found[index - 1], match)) or (
+            index + 1 < len(found) and _is_range(text, match, found[index + 1])
+        )
+        if (match.group(2) or joined
+                or CURRENCY_BEFORE.search(text[max(0, match.start() - 8):match.start()])
+                or CURRENCY_AFTER.match(text, match.end())
+                or PERIOD_AFTER.match(text, match.end())):
+            amounts.append(match.groups())
+    return amounts
+
+
+def _currency(text, magnitudes):
+    dollar = DOLLAR.search(text)
+    if dollar:
+        return DOLLAR_CURRENCIES[dollar.group(1)]
+    for symbol, code in CURRENCY_SYMBOLS.items():
+        if symbol in text:
+            return code
+    word = CURRENCY_WORDS.search(text)
+    if word:
+        return CURRENCY_WORD_CODES.get(word.group(1), word.group(1).upper())
+    if INR_MAGNITUDES & set(magnitudes):
+        return "INR"
+    return None
+
+
+def parse_salary(salary_range):
+    """
+    Parse a free-text salary into {salary_min, salary_max, salary_currency, salary_period}.
+
+    Handles ranges ("$120,000 - $150,000", "80k–100k", "12-15 LPA"), single
+    amounts ("₹12 LPA", "$45/hr"), open ranges ("up to $100k", "$90k+") and
+    k/lakh/crore magnitudes. Bare numbers with no currency, unit, period or
+    range partner are ignored. Every value is None when no amount is found, or
+    when one is too large for the salary columns.
+    """
+    parsed = dict.fromkeys(SALARY_COLUMNS)
+    if not salary_range or not salary_range.strip():
+        return parsed
+
+    text = RETIREMENT_PLAN.sub(" ", salary_range.lower().replace("–", "-").replace("—", "-"))
+    matches = _amount_matches(text)[:2]
+    if not matches:
+        return parsed
+
+    magnitudes = [magnitude for _, magnitude in matches]
+    amounts = [_amount(number, magnitude) for number, magnitude in matches]
+    if len(amounts) == 2 and not magnitudes[0] and magnitudes[1]:
+        # "80-100k": the suffix covers both ends, unless the first amount is already the larger one ("500 - 1k")
+        if float(matches[0][0].replace(",", "")) <= float(matches[1][0].replace(",", "")):
+            amounts[0] *= MAGNITUDES[magnitudes[1]]
+
+    if max(amounts) >= SALARY_LIMIT:
+        return parsed
+
+    low, high = min(amounts), max(amounts)
+    if len(amounts) == 1 and UP_TO.search(text):
+        low = None
+    elif len(amounts) == 1 and AT_LEAST.search(text):
+        high = None
+
+    period = next((name for name, pattern in PERIODS if pattern.search(text)), None)
+    if period is None:
+        period = "hour" if max(amounts) < HOURLY_RATE_LIMIT else "year"
+
+    parsed.update(
+        salary_min=round(low, 2) if low is not None else None,
+        salary_max=round(high, 2) if high is not None else None,
+        salary_currency=_currency(text, magnitudes),
+        salary_period=period
+    )
+    return parsed
+
+
+def backfill_salaries(batch_size=1000, reparse=False, on_batch=None):
+    """
+    Fill the salary columns of existing rows from salary_range, in id order, one
+    transaction per batch. Only rows never parsed are visited unless reparse is
+    set. Returns {"scanned": n, "parsed": m}.
+    """
+    unparsed = "" if reparse else " AND " + " AND ".join(f"{column} IS NULL" for column in SALARY_COLUMNS)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    summary = {"scanned": 0, "parsed": 0}
+    last_id = 0
+
+    try:
+        while True:
+            cursor.execute(f"""
+            SELECT id, salary_range FROM job_descriptions
+            WHERE id > %s AND salary_range <> ''{unparsed}
+            ORDER BY id
+            LIMIT %s
+            """, (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            values = []
+            for row in rows:
+                parsed = parse_salary(row["salary_range"])
+                if reparse or parsed["salary_period"]:
+                    values.append((row["id"], *(parsed[column] for column in SALARY_COLUMNS)))
+            if values:
+                execute_values(cursor, """
+                UPDATE job_descriptions jd SET
+                    salary_min = v.salary_min::numeric,
+                    salary_max = v.salary_max::numeric,
+                    salary_currency = v.salary_currency,
+                    salary_period = v.salary_period
+                FROM (VALUES %s) AS v(id, salary_min, salary_max, salary_currency, salary_period)
+                WHERE jd.id = v.id
+                """, values, page_size=len(values))
+            conn.commit()
+
+            summary["scanned"] += len(rows)
+            summary["parsed"] += sum(1 for value in values if value[4])
+            if on_batch:
+                on_batch(summary)
+        return summary
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
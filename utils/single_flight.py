@@ -0,0 +1,35 @@
+# utils/single_flight.py
+import asyncio
+import copy
+from utils import metrics
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls that share a key into one in-flight task.
+
+    The first caller starts the work; callers arriving while it runs await the
+    same task and each receive their own copy of its result (or its exception).
+    The work runs as a separate task, so a caller that disconnects and is
+    cancelled does not cancel it for the others. Scoped to one event loop, i.e.
+    one API worker process.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._tasks = {}
+
+    async def do(self, key, make_coroutine):
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(make_coroutine())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            metrics.increment(f"{self.name}_coalesced")
+
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _forget(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
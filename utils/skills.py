@@ -0,0 +1,132 @@
+# utils/skills.py
+import re
+from psycopg2.extras import execute_values
+
+# A trailing qualifier such as "Python (programming)" or "Go (language)"
+TRAILING_QUALIFIER = re.compile(r"\s*\([^()]*\)\s*$")
+
+# Common spellings mapped to one canonical skill; seeded into skill_aliases by the baseline migration
+SKILL_ALIASES = {
+    "Python": ["python3", "python 3", "py"],
+    "JavaScript": ["js", "javascript es6", "es6", "ecmascript"],
+    "TypeScript": ["ts"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "React": ["react.js", "reactjs", "react js"],
+    "Vue.js": ["vue", "vuejs"],
+    "Angular": ["angularjs", "angular.js"],
+    "Go": ["golang"],
+    "C#": ["c sharp", "csharp"],
+    "C++": ["cpp"],
+    "PostgreSQL": ["postgres", "postgre sql", "psql"],
+    "Kubernetes": ["k8s"],
+    "Amazon Web Services": ["aws"],
+    "Google Cloud Platform": ["gcp", "google cloud"],
+    "Microsoft Azure": ["azure"],
+    "Machine Learning": ["ml"],
+    "Artificial Intelligence": ["ai"],
+    "Natural Language Processing": ["nlp"],
+    "Continuous Integration / Continuous Delivery": ["ci/cd", "cicd", "ci cd"],
+}
+
+
+def display_skill(name):
+    """Skill name as it should be shown: single-spaced, without a trailing "(...)" qualifier"""
+    cleaned = " ".join(name.split())
+    return TRAILING_QUALIFIER.sub("", cleaned) or cleaned
+
+
+def normalize_skill(name):
+    """Dictionary key for a skill name; spellings that differ only in case, spacing or qualifier share it"""
+    return display_skill(name).lower()
+
+
+def seed_skill_aliases(cursor):
+    """Make sure every canonical skill in SKILL_ALIASES exists with its aliases"""
+    execute_values(cursor, """
+    INSERT INTO skills (name, normalized_name) VALUES %s
+    ON CONFLICT (normalized_name) DO NOTHING
+    """, [(name, normalize_skill(name)) for name in SKILL_ALIASES])
+    execute_values(cursor, """
+    INSERT INTO skill_aliases (alias, skill_id)
+    SELECT v.alias, s.id FROM (VALUES %s) AS v(alias, normalized_name)
+    JOIN skills s ON s.normalized_name = v.normalized_name
+    ON CONFLICT (alias) DO NOTHING
+    """, [
+        (normalize_skill(alias), normalize_skill(name))
+        for name, aliases in SKILL_ALIASES.items()
+        for alias in aliases
+    ])
+
+
+# Resolves (position, name, key) rows to skill ids, creating dictionary entries for unseen skills.
+# ON CONFLICT DO UPDATE (rather than DO NOTHING) so a skill created concurrently still returns its id.
+RESOLVE_SKILLS_CTE = """
+    resolved AS (
+        SELECT i.*, COALESCE(a.skill_id, s.id) AS skill_id
+        FROM input i
+        LEFT JOIN skill_aliases a ON a.alias = i.key
+        LEFT JOIN skills s ON s.normalized_name = i.key
+    ),
+    created AS (
+        INSERT INTO skills (name, normalized_name)
+        SELECT DISTINCT ON (key) name, key FROM resolved WHERE skill_id IS NULL ORDER BY key, position
+        ON CONFLICT (normalized_name) DO UPDATE SET normalized_name = EXCLUDED.normalized_name
+        RETURNING id, normalized_name
+    ),
+    skill_ids AS (
+        SELECT r.*, COALESCE(r.skill_id, c.id) AS resolved_id
+        FROM resolved r LEFT JOIN created c ON c.normalized_name = r.key
+    )
+"""
+
+# Attaches resolved skills to jobs, given an `input` CTE of (position, name, key, is_required, job_id)
+INSERT_JOB_SKILLS = RESOLVE_SKILLS_CTE + """
+    INSERT INTO job_skills (job_id, skill_id, is_required)
+    SELECT job_id, resolved_id, is_required FROM (
+        SELECT DISTINCT ON (job_id, resolved_id) job_id, resolved_id, is_required, position
+        FROM skill_ids ORDER BY job_id, resolved_id, position
+    ) unique_skills
+    ORDER BY job_id, position
+"""
+
+
+def skill_rows(names):
+    """(position, display name, key) for each non-empty skill name, in order"""
+    names = [name for name in names if isinstance(name, str) and name.strip()]
+    return [(position, display_skill(name), normalize_skill(name)) for position, name in enumerate(names)]
+
+
+def resolve_skill_ids(cursor, names):
+    """Map skill names to dictionary ids in one statement, adding unseen skills; returns {name: skill_id}"""
+    names = [name for name in names if isinstance(name, str) and name.strip()]
+    if not names:
+        return {}
+    resolved = execute_values(cursor, """
+    WITH input(position, name, key) AS (VALUES %s),
+    """ + RESOLVE_SKILLS_CTE + """
+    SELECT position, resolved_id FROM skill_ids
+    """, skill_rows(names), page_size=len(names), fetch=True)
+    ids = {row["position"]: row["resolved_id"] for row in resolved}
+    return {name: ids[position] for position, name in enumerate(names)}
+
+
+def insert_job_skills(cursor, job_id, required_skills, preferred_skills):
+    """
+    Resolve and attach a job's skills in one statement.
+
+    A skill listed twice (including via an alias) is stored once, as required
+    if either listing was required, at the position it first appeared.
+    """
+    listed = [(name, True) for name in required_skills or []]
+    listed += [(name, False) for name in preferred_skills or []]
+    listed = [(name, is_required) for name, is_required in listed if isinstance(name, str) and name.strip()]
+    if not listed:
+        return
+
+    rows = [
+        (position, display_skill(name), normalize_skill(name), is_required, job_id)
+        for position, (name, is_required) in enumerate(listed)
+    ]
+    execute_values(cursor, """
+    WITH input(position, name, key, is_required, job_id) AS (VALUES %s),
+    """ + INSERT_JOB_SKILLS, rows, page_size=len(rows))
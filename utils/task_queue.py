@@ -0,0 +1,199 @@
+# utils/task_queue.py
+import threading
+import uuid
+from contextlib import contextmanager
+from psycopg2.extras import Json
+from database import get_db_connection
+from config import TASK_LOCK_TIMEOUT, TASK_MAX_ATTEMPTS, TASK_HEARTBEAT_INTERVAL
+
+# Task lifecycle: queued -> processing (parsing, extracting, saving) -> completed | failed
+PROGRESS = {
+    "queued": 0,
+    "parsing": 10,
+    "extracting": 40,
+    "saving": 90,
+    "completed": 100,
+}
+
+
+def enqueue_analysis(filename, content):
+    """Store an uploaded document as a queued analysis task and return its id"""
+    task_id = str(uuid.uuid4())
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+        INSERT INTO analysis_tasks (id, filename, content, status, progress)
+        VALUES (%s, %s, %s, 'queued', 0)
+        """, (task_id, filename, content))
+        conn.commit()
+        return task_id
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def get_task(task_id):
+    """Return the status row for a task (without its document bytes), or None"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+        SELECT id::text AS task_id, filename, status, progress, attempts, job_id,
+               result, error, created_at, updated_at
+        FROM analysis_tasks WHERE id = %s
+        """, (task_id,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def claim_task():
+    """
+    Claim the oldest runnable task for this worker, or return None.
+
+    Tasks left in 'processing' by a worker that stopped heartbeating for
+    TASK_LOCK_TIMEOUT seconds are claimed again, so a crash or restart never
+    loses submitted work. SKIP LOCKED lets any number of workers poll at once.
+    Each claim gets a fresh claim_token; the other functions here only touch
+    the task while it still carries the token of the claim passed to them.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+        UPDATE analysis_tasks SET
+            status = 'processing',
+            progress = %s,
+            attempts = attempts + 1,
+            error = NULL,
+            claim_token = %s,
+            locked_at = CURRENT_TIMESTAMP,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = (
+            SELECT id FROM analysis_tasks
+            WHERE status = 'queued'
+               OR (status = 'processing' AND locked_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+            ORDER BY created_at
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING id::text AS task_id, filename, content, attempts, claim_token::text
+        """, (PROGRESS["parsing"], str(uuid.uuid4()), TASK_LOCK_TIMEOUT))
+        task = cursor.fetchone()
+        conn.commit()
+        return task
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        cursor.close()
+        conn.close()
+
+
+class ClaimLost(Exception):
+    """The task was reclaimed by another worker, or finished, after this claim was made"""
+
+
+# Matches a task only while it is still held by the claim passed in
+CLAIMED = "id = %s AND status = 'processing' AND claim_token = %s"
+
+
+def update_progress(task, stage):
+    """Record the stage a claimed task has reached; doubles as the worker's heartbeat. Raises ClaimLost"""
+    if not _update_task(task, """
+        progress = %s, locked_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+    """, (PROGRESS[stage],)):
+        raise ClaimLost(f"Task {task['task_id']} was reclaimed after attempt {task['attempts']}")
+
+
+@contextmanager
+def heartbeat(task, interval=TASK_HEARTBEAT_INTERVAL):
+    """
+    Refresh a claimed task's lock every `interval` seconds from a background thread while the
+    block runs, so a long parse or extraction (Gemini retries, rate-limit waits, many chunks)
+    is not reclaimed and run twice. A lost claim stops the beats; the next update_progress
+    raises ClaimLost.
+    """
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            try:
+                if not _update_task(task, "locked_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP", ()):
+                    return
+            except Exception as e:
+                # Keep trying; the lock only lapses after TASK_LOCK_TIMEOUT
+                print(f"Heartbeat for task {task['task_id']} failed: {e}")
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{task['task_id']}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def complete_task(cursor, task, job_id, result):
+    """
+    Mark a claimed task done, keep its result and drop the stored document.
+
+    Runs on the caller's cursor so the job insert and the completion commit
+    together; a worker dying in between leaves nothing half-done. Returns
+    False without changing anything when the claim was lost, in which case
+    the caller must roll back its job insert.
+    """
+    cursor.execute("""
+    UPDATE analysis_tasks SET
+        status = 'completed', progress = %s, job_id = %s, result = %s,
+        content = NULL, claim_token = NULL, locked_at = NULL, updated_at = CURRENT_TIMESTAMP
+    WHERE """ + CLAIMED, (PROGRESS["completed"], job_id, Json(result), task["task_id"], task["claim_token"]))
+    return cursor.rowcount > 0
+
+
+def fail_task(task, error, retry=True):
+    """Requeue a failed claimed task, or mark it failed once it has used TASK_MAX_ATTEMPTS or retry is off"""
+    if retry and task["attempts"] < TASK_MAX_ATTEMPTS:
+        return _update_task(task, """
+            status = 'queued', progress = 0, error = %s,
+            claim_token = NULL, locked_at = NULL, updated_at = CURRENT_TIMESTAMP
+        """, (error,))
+    return _update_task(task, """
+        status = 'failed', error = %s, claim_token = NULL, locked_at = NULL, updated_at = CURRENT_TIMESTAMP
+    """, (error,))
+
+
+def release_task(task, error):
+    """Put a claimed task back in the queue without spending one of its attempts (Gemini unavailable)"""
+    return _update_task(task, """
+        status = 'queued', progress = 0, attempts = GREATEST(attempts - 1, 0), error = %s,
+        claim_token = NULL, locked_at = NULL, updated_at = CURRENT_TIMESTAMP
+    """, (error,))
+
+
+def _update_task(task, assignments, params):
+    """Apply assignments to a task while its claim holds; returns whether it did"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(
+            "UPDATE analysis_tasks SET " + assignments + " WHERE " + CLAIMED,
+            (*params, task["task_id"], task["claim_token"])
+        )
+        conn.commit()
+        return cursor.rowcount > 0
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        cursor.close()
+        conn.close()
@@ -0,0 +1,54 @@
+# utils/upload_limit.py
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+# Allowance for multipart boundaries and part headers on top of the file bytes themselves
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadLimitMiddleware:
+    """
+    Reject request bodies over a per-path byte limit before they are parsed.
+
+    FastAPI parses a multipart form, spooling every file, before the endpoint
+    or any dependency runs, so a size check there only fires once the whole
+    upload has been received and stored. This ASGI middleware answers 413 up
+    front when Content-Length is over the limit, and otherwise counts bytes as
+    the body arrives, aborting the parse with 413 as soon as they pass it
+    (chunked uploads carry no Content-Length). Paths missing from `limits`
+    pass through untouched.
+    """
+
+    def __init__(self, app, limits):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body exceeds the {limit} byte upload limit"
+        headers = dict(scope["headers"])
+        try:
+            content_length = int(headers.get(b"content-length", b""))
+        except ValueError:
+            content_length = None
+        if content_length is not None and content_length > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions from body parsing instead of answering 400
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,130 @@
+# worker.py
+"""
+Background worker for queued job description analyses.
+
+Claims tasks submitted to /api/job-descriptions/analyze/tasks from the
+analysis_tasks table, runs the document through DocumentProcessor and saves
+the result. Run as many copies (or --processes) as the Gemini quota allows:
+
+    python worker.py --processes 4
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from config import TASK_POLL_INTERVAL, TASK_MAX_ATTEMPTS
+from database import get_db_connection
+from routers.job_descriptions import insert_job_description
+from utils.document_processor import DocumentProcessor, hash_content
+from utils.gemini_client import GeminiUnavailable
+from utils.task_queue import claim_task, update_progress, heartbeat, complete_task, fail_task, release_task, ClaimLost
+
+
+def process_task(processor, task):
+    """Run one claimed task through parsing, extraction and saving"""
+    task_id = task["task_id"]
+    attempts = task["attempts"]
+
+    # A task whose workers kept dying mid-run is reclaimed past the limit; stop retrying it
+    if attempts > TASK_MAX_ATTEMPTS:
+        fail_task(task, "Worker stopped responding on every attempt", retry=False)
+        return
+
+    content = bytes(task["content"])
+    content_hash = hash_content(content)
+
+    try:
+        extracted_info = processor.get_cached(content_hash)
+        if extracted_info is None:
+            # Parsing and extraction can outlast TASK_LOCK_TIMEOUT; keep the claim fresh meanwhile
+            with heartbeat(task):
+                text, images = processor.read_document(content, task["filename"])
+
+                update_progress(task, "extracting")
+                extracted_info = processor.extract_with_gemini(text, images, content_hash)
+
+        update_progress(task, "saving")
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            job_id = insert_job_description(cursor, extracted_info)
+            if not complete_task(cursor, task, job_id, {**extracted_info, "id": job_id}):
+                # Another worker reclaimed the task while this one ran; its run saves the job
+                raise ClaimLost(f"Task {task_id} was reclaimed after attempt {attempts}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cursor.close()
+            conn.close()
+
+        print(f"Task {task_id} completed as job {job_id}")
+    except ClaimLost as e:
+        # The task belongs to its new claim now; record nothing for this one
+        print(f"Task {task_id} abandoned: {e}")
+    except GeminiUnavailable as e:
+        # Not the document's fault: requeue it and back off until Gemini may be healthy again
+        print(f"Task {task_id} requeued: {e}")
+        release_task(task, str(e))
+        time.sleep(e.retry_after or TASK_POLL_INTERVAL)
+    except (ValueError, NotImplementedError) as e:
+        # The document itself is unusable, retrying cannot help
+        print(f"Task {task_id} failed: {e}")
+        fail_task(task, str(e), retry=False)
+    except Exception as e:
+        print(f"Task {task_id} attempt {attempts} failed: {e}")
+        fail_task(task, str(e))
+
+
+def run_worker(poll_interval=TASK_POLL_INTERVAL):
+    """Claim and process tasks until interrupted"""
+    processor = DocumentProcessor()
+    print(f"Analysis worker {os.getpid()} started")
+
+    while True:
+        try:
+            task = claim_task()
+        except Exception as e:
+            print(f"Error claiming analysis task: {e}")
+            task = None
+
+        if not task:
+            time.sleep(poll_interval)
+            continue
+
+        try:
+            process_task(processor, task)
+        except Exception as e:
+            # Recording the outcome failed (e.g. the database is briefly away); the task is
+            # reclaimed once its lock times out, so keep this worker alive
+            print(f"Error processing analysis task {task['task_id']}: {e}")
+            time.sleep(poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process queued job description analyses")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes to run")
+    parser.add_argument("--poll-interval", type=float, default=TASK_POLL_INTERVAL)
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker(args.poll_interval)
+        return
+
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(args.poll_interval,))
+        for _ in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == "__main__":
+    main()